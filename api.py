@@ -0,0 +1,178 @@
+"""Headless scoring service.
+
+Run with several workers, e.g.::
+
+    uvicorn api:app --workers 4
+
+Each worker loads the model once through the shared registry. Concurrent
+single-record requests are coalesced by a micro-batcher into one vectorized
+probability call.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Literal, Union
+
+import numpy as np
+from fastapi import FastAPI, Query
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+
+import instrumentation
+from model_registry import get_pipeline, registry
+from schema import FIELDS
+from scoring import DEFAULT_THRESHOLD, FEATURES, OVERTIME_CODES, apply_threshold
+
+
+# Requests arriving within this window are scored together
+BATCH_WINDOW_SECONDS = 0.002
+MAX_BATCH_SIZE = 512
+
+
+def _bounded(name):
+    # Whole numbers within the batch schema's bounds (30.0 passes, 30.5 doesn't)
+    return Field(ge=FIELDS[name].min, le=FIELDS[name].max)
+
+
+class Employee(BaseModel):
+    Age: int = _bounded("Age")
+    MonthlyIncome: int = _bounded("MonthlyIncome")
+    TotalWorkingYears: int = _bounded("TotalWorkingYears")
+    YearsAtCompany: int = _bounded("YearsAtCompany")
+    JobSatisfaction: int = _bounded("JobSatisfaction")
+    WorkLifeBalance: int = _bounded("WorkLifeBalance")
+    EnvironmentSatisfaction: int = _bounded("EnvironmentSatisfaction")
+    OverTime: Union[Literal["Yes", "No"], Literal[0, 1]]
+
+    def to_row(self):
+        values = [getattr(self, col) for col in FEATURES]
+        if isinstance(self.OverTime, str):
+            values[-1] = OVERTIME_CODES[self.OverTime]
+        return values
+
+
+class BatchRequest(BaseModel):
+    records: List[Employee]
+
+
+class Prediction(BaseModel):
+    prediction: str
+    label: int
+    probability: float
+    threshold: float
+
+
+class BatchPrediction(BaseModel):
+    predictions: List[Prediction]
+
+
+def _predictions(probabilities, threshold):
+    labels = apply_threshold(probabilities, threshold)
+    return [
+        Prediction(
+            prediction="Likely to Leave" if label == 1 else "Likely to Stay",
+            label=int(label),
+            probability=float(probability),
+            threshold=threshold
+        )
+        for label, probability in zip(labels, probabilities)
+    ]
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-row requests into one scoring call.
+
+    The first row to arrive starts a timer; every row submitted before it
+    fires (or until ``max_batch`` rows are queued) is scored in the same
+    ``predict_proba`` call.
+    """
+
+    def __init__(self, max_wait=BATCH_WINDOW_SECONDS, max_batch=MAX_BATCH_SIZE):
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self._rows = []
+        self._futures = []
+        self._timer = None
+        self.batches = 0
+        self.rows = 0
+
+    async def submit(self, row):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._rows.append(row)
+        self._futures.append(future)
+
+        if len(self._rows) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        rows, futures = self._rows, self._futures
+        self._rows, self._futures = [], []
+        if not rows:
+            return
+
+        # Runs on the event loop: for the linear fast path a few hundred rows
+        # take microseconds, far less than a thread hand-off would
+        try:
+            probabilities = get_pipeline().predict_proba(np.array(rows, dtype=np.float64))
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.rows += len(rows)
+        for future, probability in zip(futures, probabilities):
+            if not future.done():
+                future.set_result(float(probability))
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Load before the first request so it doesn't pay the unpickling cost
+    get_pipeline()
+    yield
+
+
+app = FastAPI(title="Employee Attrition Scoring API", lifespan=lifespan)
+batcher = MicroBatcher()
+ThresholdParam = Query(DEFAULT_THRESHOLD, ge=0.0, le=1.0)
+
+
+@app.get("/health")
+def health():
+    return {
+        "status": "ok",
+        "model_version": registry.version(),
+        "batches": batcher.batches,
+        "rows": batcher.rows
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Stage histograms of this worker; empty unless ATTRITION_INSTRUMENTATION=1
+    return instrumentation.prometheus_text()
+
+
+@app.post("/predict", response_model=Prediction)
+async def predict(employee: Employee, threshold: float = ThresholdParam):
+    probability = await batcher.submit(employee.to_row())
+    return _predictions(np.array([probability]), threshold)[0]
+
+
+@app.post("/predict/batch", response_model=BatchPrediction)
+def predict_batch(request: BatchRequest, threshold: float = ThresholdParam):
+    if not request.records:
+        return BatchPrediction(predictions=[])
+    features = np.array([employee.to_row() for employee in request.records], dtype=np.float64)
+    probabilities = get_pipeline().predict_proba(features)
+    return BatchPrediction(predictions=_predictions(probabilities, threshold))
@@ -1,9 +1,18 @@
+import functools
+import os
+import time
+
+_rerun_start = time.perf_counter()
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import joblib
-from textwrap import dedent
-import streamlit.components.v1 as components
+
+# Only lightweight modules are imported up front so the login screen paints
+# quickly on a cold start. pandas, scikit-learn, matplotlib and the model
+# artifacts are imported by the page that first needs them.
+import instrumentation
+from kpi_store import kpis, rates
+from model_registry import get_model_card, get_pipeline, registry
+from prediction_cache import prediction_cache
 
 
 # ---------------- PAGE CONFIG ---------------- #
@@ -76,10 +85,6 @@ h1 {
 """, unsafe_allow_html=True)
 
 
-# ---------------- LOAD MODEL ---------------- #
-model = joblib.load("models/student_model.joblib")
-scaler = joblib.load("models/scaler.joblib")
-
 # ---------------- LOGIN USERS ---------------- #
 USERS = {
     "admin": "admin123",
@@ -131,14 +136,48 @@ def login_page():
         """, unsafe_allow_html=True)
 
 # ---------------- DASHBOARD ---------------- #
+def dashboard_summary():
+    # The summary store holds running counts; the full dataset is only
+    # scanned again when the CSV or the model artifacts change
+    import insights
+    from scoring import FEATURES
+
+    summary = kpis.read()
+
+    digest = insights.dataset_hash()
+    if summary["dataset_hash"] != digest:
+        df = insights.get_dataset(["Attrition"])
+        summary = kpis.sync_dataset(digest, len(df), (df["Attrition"] == "Yes").sum())
+
+    if summary["drift_model"] != registry.version() or summary["drift_dataset"] != digest:
+        import drift
+
+        df = insights.get_dataset(FEATURES)
+        pipeline = get_pipeline()
+        baseline = drift.summarize(df, pipeline.predict_proba(pipeline.prepare(df)))
+        summary = kpis.sync_drift_baseline(registry.version(), digest, baseline)
+
+    return summary
+
+
+def format_rate(rate):
+    return "–" if rate is None else f"{rate:.0%}"
+
+
 def dashboard():
     st.title("📊 HR Analytics Dashboard")
     st.markdown("<br>", unsafe_allow_html=True)
 
+    summary = dashboard_summary()
+    kpi_rates = rates(summary)
+    # Held-out accuracy from training; the full CSV is mostly training rows
+    card = get_model_card()
+    accuracy = card["test_metrics"]["accuracy"] if card else None
+
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown("""
+        st.markdown(f"""
             <div style='
             background: linear-gradient(135deg, #a5b4fc 0%, #818cf8 100%);
             padding: 1.5rem;
@@ -148,28 +187,40 @@ def dashboard():
             box-shadow: 0 10px 25px rgba(0,0,0,0.15);
         '>
             <h3 style='font-size: 1rem; margin: 0;'>Total Employees</h3>
-            <h1 style='font-size: 2.8rem; margin: 0.5rem 0; font-weight: 800;'>1,470</h1>
+            <h1 style='font-size: 2.8rem; margin: 0.5rem 0; font-weight: 800;'>{summary["employees"]:,}</h1>
         </div>
         """, unsafe_allow_html=True)
     
     with col2:
-        st.markdown("""
+        st.markdown(f"""
             <div style='background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); 
                         padding: 1.5rem; border-radius: 12px; text-align: center; color: white;'>
                 <h3 style='color: white; font-size: 1rem; margin: 0;'>Attrition Rate</h3>
-                <h1 style='color: white; font-size: 2.5rem; margin: 0.5rem 0;'>16%</h1>
+                <h1 style='color: white; font-size: 2.5rem; margin: 0.5rem 0;'>{format_rate(kpi_rates["attrition_rate"])}</h1>
             </div>
         """, unsafe_allow_html=True)
     
     with col3:
-        st.markdown("""
+        st.markdown(f"""
             <div style='background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); 
                         padding: 1.5rem; border-radius: 12px; text-align: center; color: white;'>
                 <h3 style='color: white; font-size: 1rem; margin: 0;'>Model Accuracy</h3>
-                <h1 style='color: white; font-size: 2.5rem; margin: 0.5rem 0;'>85%</h1>
+                <h1 style='color: white; font-size: 2.5rem; margin: 0.5rem 0;'>{format_rate(accuracy)}</h1>
             </div>
         """, unsafe_allow_html=True)
 
+    if card is None:
+        st.caption("Model accuracy appears once `python -m train` has written `models/model_card.json`.")
+
+    if summary["scored"]:
+        st.caption(
+            f"📂 {summary['scored']:,} employees scored in batch uploads, "
+            f"{format_rate(kpi_rates['flagged_rate'])} flagged as likely to leave "
+            f"(mean risk {format_rate(kpi_rates['mean_probability'])})"
+        )
+
+    drift_panel(summary)
+
     st.markdown("<br><br>", unsafe_allow_html=True)
 
     st.markdown("""
@@ -202,8 +253,57 @@ def dashboard():
         </div>
     """, unsafe_allow_html=True)
 
+def drift_panel(summary):
+    # Running histograms from the KPI store; no upload is read again
+    import drift
+
+    baseline = summary["drift_baseline"]
+    if not baseline or not summary["drift_total"]:
+        return
+
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("### 📡 Drift Monitoring")
+    scope = st.radio("Compare", ["All uploads", "Latest upload"], horizontal=True, key="drift_scope")
+    observed = summary["drift_total"] if scope == "All uploads" else summary["drift_latest"]
+
+    table = drift.compare(baseline, observed)
+    st.caption(
+        f"{observed['rows']:,} scored employees compared with the training data. "
+        f"PSI below {drift.PSI_WARNING} is stable, above {drift.PSI_ALERT} has drifted"
+    )
+    st.dataframe(table.round(3), hide_index=True)
+
+    feature = st.selectbox("Distribution", list(table["Feature"]), index=int(table["PSI"].idxmax()),
+                           key="drift_feature")
+    st.bar_chart(drift.distributions(baseline, observed, feature), stack=False)
+
+
+# ---------------- DECISION THRESHOLD ---------------- #
+def threshold_slider(key):
+    from scoring import DEFAULT_THRESHOLD
+
+    return st.slider(
+        "🎚️ Decision Threshold",
+        0.05, 0.95, DEFAULT_THRESHOLD, step=0.05, key=key,
+        help="Employees at or above this probability are flagged as likely to leave. "
+             "Lower it to catch more leavers (recall), raise it to reduce false alarms (precision)."
+    )
+
 # ---------------- PREDICTION PAGE ---------------- #
 def prediction_page():
+    import numpy as np
+    import pandas as pd
+
+    import risk_rules
+    import what_if
+    from schema import FIELDS
+    from scoring import FEATURES, apply_threshold, top_factors
+
+    pipeline = get_pipeline()
+
+    def bounds(name):
+        return FIELDS[name].min, FIELDS[name].max
+
     st.title("🔮 Employee Attrition Prediction")
     st.markdown("<br>", unsafe_allow_html=True)
 
@@ -221,15 +321,15 @@ def prediction_page():
     
     with col1:
         st.markdown("#### 👤 Personal Details")
-        age = st.number_input("Age", 18, 60, 30, help="Employee's age")
-        monthly_income = st.number_input("Monthly Income ($)", 1000, 200000, 50000, step=1000, 
+        age = st.number_input("Age", *bounds("Age"), 30, help="Employee's age")
+        monthly_income = st.number_input("Monthly Income ($)", *bounds("MonthlyIncome"), 50000, step=1000, 
                                         help="Current monthly salary")
     
     with col2:
         st.markdown("#### 💼 Work Experience")
-        total_working_years = st.number_input("Total Working Years", 0, 40, 5, 
+        total_working_years = st.number_input("Total Working Years", *bounds("TotalWorkingYears"), 5, 
                                              help="Total years of professional experience")
-        years_at_company = st.number_input("Years at Company", 0, 40, 3, 
+        years_at_company = st.number_input("Years at Company", *bounds("YearsAtCompany"), 3, 
                                           help="Years spent at current company")
 
     st.markdown("<br>", unsafe_allow_html=True)
@@ -270,11 +370,31 @@ def prediction_page():
 
     st.markdown("<br>", unsafe_allow_html=True)
 
+    threshold = threshold_slider("prediction_threshold")
+
+    def predict():
+        risks, suggestions = risk_rules.for_record(dict(zip(FEATURES, input_data[0])))
+        return {
+            "probability": float(pipeline.predict_proba(input_data)[0]),
+            "contributions": (
+                pipeline.contributions(input_data)[0].tolist() if pipeline.is_explainable else None
+            ),
+            "risks": risks,
+            "suggestions": suggestions
+        }
+
     if st.button("🔍 Predict Attrition Risk"):
         with st.spinner("Analyzing employee data..."):
-            scaled = scaler.transform(input_data)
-            prediction = model.predict(scaled)[0]
-            probability = model.predict_proba(scaled)[0][1]
+            # Shared across sessions: HR users often score the same profiles
+            result = prediction_cache.get_or_compute(registry.version(), input_data[0], predict)
+        st.session_state.last_prediction = {"inputs": input_data.tolist(), **result}
+
+    # Keep the last result while only the threshold changes, so tuning it
+    # doesn't require scoring again
+    last_prediction = st.session_state.get("last_prediction")
+    if last_prediction is not None and last_prediction["inputs"] == input_data.tolist():
+        probability = last_prediction["probability"]
+        prediction = apply_threshold(probability, threshold)
 
         st.markdown("<br>", unsafe_allow_html=True)
 
@@ -303,30 +423,27 @@ def prediction_page():
 
         st.markdown("<br>", unsafe_allow_html=True)
 
-        st.markdown("### 🔍 Identified Risk Factors")
-
-        risks = []
-        suggestions = []
-
-        if job_satisfaction <= 2:
-            risks.append(("Low Job Satisfaction", "😞"))
-            suggestions.append("Improve role clarity, recognition programs, and growth opportunities")
-
-        if work_life_balance <= 2:
-            risks.append(("Poor Work-Life Balance", "⚖️"))
-            suggestions.append("Introduce flexible working hours or redistribute workload")
-
-        if overtime_val == 1:
-            risks.append(("Frequent Overtime", "⏰"))
-            suggestions.append("Reduce overtime by reallocating tasks or adding resources")
+        contributions = last_prediction.get("contributions")
+        if contributions is not None:
+            st.markdown("### 🧠 What Drives This Prediction")
+            top = [names[0] for names in top_factors([contributions]) if names[0]]
+            if top:
+                st.markdown(f"**Top factors:** {', '.join(top)}")
+            st.bar_chart(
+                pd.Series(contributions, index=FEATURES, name="Contribution"),
+                horizontal=True, sort="-Contribution"
+            )
+            st.caption(
+                "Each feature's contribution to the model's score for this employee, relative to "
+                "the average employee (log-odds for linear models, probability for tree models). "
+                "Positive values push towards leaving."
+            )
+            st.markdown("<br>", unsafe_allow_html=True)
 
-        if monthly_income < 30000:
-            risks.append(("Below Market Salary", "💰"))
-            suggestions.append("Review salary structure and provide competitive compensation")
+        st.markdown("### 🔍 Identified Risk Factors")
 
-        if total_working_years < 3:
-            risks.append(("Limited Work Experience", "📚"))
-            suggestions.append("Provide mentorship and structured training programs")
+        risks = last_prediction["risks"]
+        suggestions = last_prediction["suggestions"]
 
         if risks:
             for risk, emoji in risks:
@@ -364,8 +481,25 @@ def prediction_page():
                 </div>
             """, unsafe_allow_html=True)
 
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown("### 🧪 What-If Analysis")
+        st.caption("How this employee's risk changes when one feature is changed and the rest stay the same")
+        what_if_charts(what_if.sweep(pipeline, input_data), "prediction", current=input_data[0])
+
+    cache_stats = prediction_cache.stats()
+    if cache_stats["hit_rate"] is not None:
+        st.caption(
+            f"🗃️ Prediction cache: {cache_stats['hits']:,} hits / "
+            f"{cache_stats['hits'] + cache_stats['misses']:,} lookups "
+            f"({cache_stats['hit_rate']:.0%} hit rate, {cache_stats['entries']:,} cached profiles)"
+        )
+
 
 def batch_prediction_page():
+    import pandas as pd
+
+    from batch_jobs import DONE, FAILED, jobs
+    from result_store import content_hash, result_key, result_store
 
     st.title("📂 Batch Employee Prediction")
     st.markdown("<br>", unsafe_allow_html=True)
@@ -381,106 +515,280 @@ def batch_prediction_page():
     """, unsafe_allow_html=True)
 
     uploaded_file = st.file_uploader("Upload CSV File", type=["csv"])
+    threshold = threshold_slider("batch_threshold")
+
+    with st.expander("⚙️ Advanced"):
+        workers = st.number_input(
+            "Parallel Workers", 1, os.cpu_count() or 1, 1,
+            help="Score very large files in several processes (uses more CPU cores)"
+        )
 
     if uploaded_file is not None:
 
         try:
-            df = pd.read_csv(uploaded_file)
-
             st.subheader("📄 Uploaded Dataset")
-            st.dataframe(df.head())
-
-            # Handle OverTime conversion
-            if "OverTime" in df.columns:
-                df["OverTime"] = df["OverTime"].map({
-                    "Yes": 1,
-                    "No": 0
-                })
-
-            required_columns = [
-                "Age",
-                "MonthlyIncome",
-                "TotalWorkingYears",
-                "YearsAtCompany",
-                "JobSatisfaction",
-                "WorkLifeBalance",
-                "EnvironmentSatisfaction",
-                "OverTime"
-            ]
-
-            # Auto reorder
-            input_data = df.reindex(columns=required_columns)
-
-            # Fill missing if any
-            input_data = input_data.fillna(0)
-
-            scaled_data = scaler.transform(input_data)
-
-            predictions = model.predict(scaled_data)
-            probabilities = model.predict_proba(scaled_data)[:, 1]
-
-            df["Prediction"] = np.where(
-                predictions == 1,
-                "Likely to Leave",
-                "Likely to Stay"
-            )
+            uploaded_file.seek(0)
+            st.dataframe(pd.read_csv(uploaded_file, nrows=5))
+            uploaded_file.seek(0)
+
+            # Results live server-side keyed by the upload's content, so
+            # reruns (paging, sorting, filtering) never score it again
+            upload_hashes = st.session_state.setdefault("upload_hashes", {})
+            first_seen = uploaded_file.file_id not in upload_hashes
+            if first_seen:
+                upload_hashes[uploaded_file.file_id] = content_hash(uploaded_file)
+            key = result_key(upload_hashes[uploaded_file.file_id], registry.version())
+            view = result_store.get(key)
+
+            # Count each upload in the KPIs once, however often it is rescored
+            recorded = st.session_state.setdefault("kpi_recorded_uploads", set())
+            record_kpis = uploaded_file.file_id not in recorded
+            recorded.add(uploaded_file.file_id)
+
+            if view is None:
+                # Scoring runs as a background job, so leaving the page or
+                # reconnecting doesn't lose it
+                submitted = st.session_state.setdefault("batch_jobs", {})
+                job = jobs.get(submitted[key]) if key in submitted else None
+                if job is not None and job["status"] == DONE:
+                    # Finished, but the result has since been evicted or
+                    # deleted: score the file again
+                    job = None
+
+                if job is None:
+                    submitted[key] = jobs.submit(
+                        st.session_state.user, uploaded_file, uploaded_file.name, key,
+                        threshold, workers, record_kpis=record_kpis
+                    )
+                    job_progress(submitted[key])
+                elif job["status"] == FAILED:
+                    st.error(f"❌ Error: {job['error']}")
+                    if st.button("🔁 Retry"):
+                        del submitted[key]
+                        if job["record_kpis"]:
+                            # The failed job counted nothing; the retry must
+                            recorded.discard(uploaded_file.file_id)
+                        st.rerun()
+                else:
+                    job_progress(submitted[key])
+            else:
+                if first_seen:
+                    st.caption("♻️ This file was scored before; showing the saved results")
+                if record_kpis:
+                    kpis.record_predictions(view.scored, view.flagged(threshold), view.probability_sum, view.drift)
 
-            df["Attrition Probability"] = (probabilities * 100).round(2)
+                st.subheader("✅ Prediction Results")
+                result_viewer(view, key, threshold)
+                department_what_if(view, key)
 
-            st.subheader("✅ Prediction Results")
-            st.dataframe(df)
+        except Exception as e:
+            st.error(f"❌ Error: {e}")
 
-            csv = df.to_csv(index=False).encode("utf-8")
+    job_history(threshold)
 
-            st.download_button(
-                "📥 Download Results",
-                csv,
-                "batch_predictions.csv",
-                "text/csv"
-            )
 
-        except Exception as e:
-            st.error(f"❌ Error: {e}")
+@st.fragment(run_every=1)
+def job_progress(job_id):
+    from batch_jobs import QUEUED, RUNNING, jobs
 
+    job = jobs.get(job_id)
+    if job["status"] not in (QUEUED, RUNNING):
+        # Finished: rerun the page to show the results (or the error)
+        st.rerun()
+
+    if job["status"] == QUEUED:
+        st.progress(0.0, text="Waiting for a free scoring worker...")
+    else:
+        st.progress(job["progress"], text="Scoring employees...")
+    st.caption(f"🧾 Job {job_id[:8]} runs in the background; you can leave this page and come back")
 
-def data_insights_page():
 
+def job_history(threshold):
     import pandas as pd
-    import seaborn as sns
-    import matplotlib.pyplot as plt
+
+    from batch_jobs import DONE, jobs
+    from result_store import result_store
+
+    recent = jobs.recent(st.session_state.user)
+    if not recent:
+        return
+
+    with st.expander("🗂️ Your Recent Jobs"):
+        table = pd.DataFrame(recent)
+        table["submitted"] = pd.to_datetime(table["created_at"], unit="s").dt.strftime("%Y-%m-%d %H:%M:%S")
+        table["job"] = table["id"].str[:8]
+        st.dataframe(
+            table[["job", "filename", "status", "progress", "rows", "submitted", "error"]],
+            hide_index=True
+        )
+
+        finished = {f"{job['id'][:8]} – {job['filename']}": job for job in recent if job["status"] == DONE}
+        if finished:
+            choice = st.selectbox("Open results", ["–"] + list(finished), key="job_history_choice")
+            if choice != "–":
+                view = result_store.get(finished[choice]["result_key"])
+                if view is None:
+                    st.info("These results were evicted from the store; upload the file again to rescore it.")
+                else:
+                    result_viewer(view, finished[choice]["result_key"], threshold, prefix="job_results")
+
+
+RESULT_SORTS = {
+    "Highest risk first": "probability_desc",
+    "Lowest risk first": "probability_asc",
+    "File order": "file"
+}
+
+
+def result_viewer(view, key, threshold, prefix="results"):
+    # Only the visible page is read from the store and sent to the browser;
+    # predictions are relabelled for the threshold, never rescored
+    if view.invalid:
+        st.warning(
+            f"⚠️ {view.invalid:,} of {view.rows:,} rows failed validation and weren't scored; "
+            "see the Validation Errors column. Having no probability, they come last when sorted "
+            "by highest risk and first when sorted by lowest risk"
+        )
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        sort = st.selectbox("Sort", list(RESULT_SORTS), key=f"{prefix}_sort")
+
+    with col2:
+        departments = view.departments()
+        department = st.selectbox(
+            "Department", ["All"] + departments, key=f"{prefix}_department",
+            disabled=not departments
+        )
+        department = None if department == "All" else department
+
+    with col3:
+        page_size = st.selectbox("Rows per page", [25, 50, 100, 500], index=1, key=f"{prefix}_page_size")
+
+    total = view.count(department)
+    pages = max(1, -(-total // page_size))
+    # Keyed by the view settings so any change starts again from page 1
+    page = st.number_input(
+        f"Page (of {pages:,})", 1, pages, 1,
+        key=f"{prefix}_page_{key}_{sort}_{department}_{page_size}"
+    )
+
+    offset = (page - 1) * page_size
+    st.dataframe(view.page(offset, page_size, RESULT_SORTS[sort], department, threshold))
+    st.caption(f"Rows {min(offset + 1, total):,}–{min(offset + page_size, total):,} of {total:,}")
+
+    st.download_button(
+        "📥 Download Results",
+        functools.partial(view.to_csv_bytes, threshold),
+        "batch_predictions.csv",
+        "text/csv",
+        key=f"{prefix}_download_{key}_{threshold}"
+    )
+
+
+def what_if_charts(table, prefix, current=None):
+    """Sensitivity bar chart and a per-feature curve for a what-if sweep table."""
+    import pandas as pd
+
+    import what_if
+    from scoring import FEATURES
+
+    spread = what_if.sensitivity(table) * 100
+    st.markdown("**Largest possible change in attrition probability (percentage points)**")
+    st.bar_chart(
+        pd.Series(spread.to_numpy(), index=spread.index, name="Change"), horizontal=True, sort="-Change"
+    )
+
+    feature = st.selectbox("Feature", list(spread.index), key=f"{prefix}_what_if_feature")
+    curve = table[table["Feature"] == feature]
+    st.line_chart(
+        pd.DataFrame({"Attrition probability (%)": curve["Probability"].to_numpy() * 100},
+                     index=pd.Index(curve["Value"].to_numpy(), name=feature))
+    )
+    best = curve.loc[curve["Probability"].idxmin()]
+    text = f"Lowest risk at {feature} = {best['Value']:g}: {best['Probability']:.1%} ({best['Change'] * 100:+.1f} pts)"
+    if current is not None:
+        text = f"Currently {feature} = {current[FEATURES.index(feature)]:g}. " + text
+    else:
+        text += f", a change for {best['Affected']:.0%} of employees"
+    st.caption(text)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def department_sweep(key, department, model_version):
+    # Cached per stored result and department; the result never changes
+    import what_if
+    from batch_scoring import INVALID_LABEL
+    from result_store import result_store
+    from scoring import FEATURES
+
+    view = result_store.get(key)
+    if view is None:
+        return None
+    frame = view.select(FEATURES + ["Prediction"], department)
+    frame = frame[frame["Prediction"] != INVALID_LABEL]
+    if frame.empty:
+        return None
+    pipeline = get_pipeline()
+    return what_if.sweep(pipeline, pipeline.prepare(frame)), len(frame)
+
+
+def department_what_if(view, key):
+    from what_if import SWEEP_MAX_EMPLOYEES
+
+    departments = view.departments()
+    if not departments:
+        return
+    with st.expander("🧪 Department What-If"):
+        department = st.selectbox("Department", departments, key="what_if_department")
+        with st.spinner("Sweeping every employee's features..."):
+            result = department_sweep(key, department, registry.version())
+        if result is None:
+            st.info("No scored employees in this department")
+            return
+        table, employees = result
+        st.caption(
+            f"Mean attrition probability across {employees:,} employees when one feature is set to the "
+            f"same value for all of them"
+            + (f" (a random sample of {SWEEP_MAX_EMPLOYEES:,})" if employees > SWEEP_MAX_EMPLOYEES else "")
+        )
+        what_if_charts(table, "department")
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def insight_figures(dataset_digest):
+    # Keyed by the dataset hash: computed once per CSV version and shared by
+    # every session until the file changes
+    import insights
+
+    return insights.render_figures(insights.compute_aggregates(insights.get_dataset(insights.INSIGHT_COLUMNS)))
+
+
+def data_insights_page():
+    import insights
 
     st.title("📊 Employee Data Insights")
     st.markdown("<br>", unsafe_allow_html=True)
 
-    df = pd.read_csv("HR-Employee-Attrition.csv")
+    figures = insight_figures(insights.dataset_hash())
 
     st.subheader("Attrition Distribution")
-
-    fig1, ax1 = plt.subplots()
-    sns.countplot(x="Attrition", data=df, ax=ax1)
-    st.pyplot(fig1)
+    st.image(figures["attrition"])
 
     st.subheader("Attrition by Department")
-
-    fig2, ax2 = plt.subplots()
-    sns.countplot(x="Department", hue="Attrition", data=df, ax=ax2)
-    plt.xticks(rotation=45)
-    st.pyplot(fig2)
+    st.image(figures["department"])
 
     st.subheader("Age Distribution")
-
-    fig3, ax3 = plt.subplots()
-    sns.histplot(df["Age"], bins=20, kde=True, ax=ax3)
-    st.pyplot(fig3)
+    st.image(figures["age"])
 
     st.subheader("Salary Distribution")
-
-    fig4, ax4 = plt.subplots()
-    sns.histplot(df["MonthlyIncome"], bins=20, kde=True, ax=ax4)
-    st.pyplot(fig4)
+    st.image(figures["income"])
 
 # ---------------- ABOUT PAGE ---------------- #
 def about_page():
+    import streamlit.components.v1 as components
+
     st.title("ℹ️ About the Project")
     st.markdown("<br>", unsafe_allow_html=True)
 
@@ -536,6 +844,43 @@ def about_page():
 
 
 
+# ---------------- INSTRUMENTATION PAGE ---------------- #
+def instrumentation_page():
+    st.title("⏱️ Performance Instrumentation")
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    if st.session_state.user != "admin":
+        st.error("❌ Admin access required")
+        return
+
+    enabled = st.toggle(
+        "Record timings", value=instrumentation.enabled(),
+        help="Applies to the whole server process; negligible overhead when off"
+    )
+    if enabled != instrumentation.enabled():
+        instrumentation.set_enabled(enabled)
+
+    if st.button("🧹 Reset Timings"):
+        instrumentation.reset()
+
+    rows = instrumentation.snapshot()
+    if not rows:
+        st.info("No timings recorded yet. Enable recording and use the other pages.")
+        return
+
+    import pandas as pd
+
+    st.subheader("Per-Stage Latency")
+    st.dataframe(pd.DataFrame(rows).round(3), hide_index=True)
+
+    st.subheader("Total Time by Stage (ms)")
+    st.bar_chart(pd.DataFrame(rows).set_index("stage")["total_ms"])
+
+    metrics = instrumentation.prometheus_text()
+    with st.expander("Prometheus export"):
+        st.code(metrics, language="text")
+    st.download_button("📥 Download Metrics", metrics, "metrics.prom", "text/plain")
+
 # ---------------- MAIN APP ---------------- #
 def main_app():
     st.sidebar.markdown(f"""
@@ -546,9 +891,13 @@ def main_app():
         </div>
     """, unsafe_allow_html=True)
 
+    pages = ["Dashboard", "Prediction", "Batch Prediction", "Data Insights", "About"]
+    if st.session_state.user == "admin":
+        pages.append("Instrumentation")
+
     menu = st.sidebar.radio(
         "🧭 Navigation",
-        ["Dashboard", "Prediction", "Batch Prediction", "Data Insights", "About"],
+        pages,
         label_visibility="visible"
     )
 
@@ -558,16 +907,25 @@ def main_app():
         st.session_state.logged_in = False
         st.rerun()
 
-    if menu == "Dashboard":
-        dashboard()
-    elif menu == "Prediction":
-        prediction_page()
-    elif menu == "Batch Prediction":
-        batch_prediction_page()
-    elif menu == "Data Insights":
-        data_insights_page()
-    else:
-        about_page()
+    last_rerun = st.session_state.get("last_rerun_seconds")
+    st.sidebar.caption(
+        f"⏱️ Model load: {registry.total_load_seconds() * 1000:.0f} ms"
+        + (f" | Last rerun: {last_rerun * 1000:.0f} ms" if last_rerun is not None else "")
+    )
+
+    with instrumentation.span(f"page.{menu}"):
+        if menu == "Dashboard":
+            dashboard()
+        elif menu == "Prediction":
+            prediction_page()
+        elif menu == "Batch Prediction":
+            batch_prediction_page()
+        elif menu == "Data Insights":
+            data_insights_page()
+        elif menu == "Instrumentation":
+            instrumentation_page()
+        else:
+            about_page()
 
 # ---------------- ROUTER ---------------- #
 if st.session_state.logged_in:
@@ -576,3 +934,8 @@ else:
 
     login_page()
 
+st.session_state.last_rerun_seconds = time.perf_counter() - _rerun_start
+if instrumentation.enabled():
+    instrumentation.observe("rerun" if st.session_state.logged_in else "rerun.login",
+                            st.session_state.last_rerun_seconds)
+
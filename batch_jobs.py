@@ -0,0 +1,235 @@
+"""Background batch scoring jobs with a SQLite job table.
+
+The Batch Prediction page saves an upload under ``data/jobs/`` and submits
+it here; scoring runs on a small thread pool (``ATTRITION_JOB_WORKERS``,
+default 2) instead of inside the Streamlit script run, so navigating away
+or reconnecting doesn't lose the work. Progress and status live in
+``data/jobs.sqlite3``, which any session can poll. Finished results go to
+the result store (see result_store.py) under the job's result key.
+
+Jobs left queued or running by a previous server process are picked up
+again the first time the queue is used.
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from batch_scoring import SCORED_CSV_DTYPES, iter_scored_chunks, read_chunks
+from kpi_store import kpis
+from model_registry import get_pipeline, registry
+from parallel_scoring import score_parallel
+from result_store import result_store
+from row_cache import row_caches
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+JOBS_DIR = os.path.join(DATA_DIR, "jobs")
+DB_PATH = os.path.join(DATA_DIR, "jobs.sqlite3")
+
+JOB_WORKERS = int(os.environ.get("ATTRITION_JOB_WORKERS", "2"))
+
+# Progress is written to the job table at most this often
+PROGRESS_INTERVAL_SECONDS = 0.5
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    input_path TEXT NOT NULL,
+    result_key TEXT NOT NULL,
+    threshold REAL NOT NULL,
+    workers INTEGER NOT NULL,
+    record_kpis INTEGER NOT NULL DEFAULT 1,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    rows INTEGER,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+)
+"""
+
+
+class JobStore:
+    """The job table; every call uses its own connection, so it is thread-safe."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        if not self._initialized:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+            connection.commit()
+            self._initialized = True
+        return connection
+
+    def _execute(self, sql, params=()):
+        connection = self._connect()
+        try:
+            with connection:
+                return [dict(row) for row in connection.execute(sql, params)]
+        finally:
+            connection.close()
+
+    def create(self, **fields):
+        columns = ", ".join(fields)
+        placeholders = ", ".join("?" for _ in fields)
+        self._execute(f"INSERT INTO jobs ({columns}) VALUES ({placeholders})", tuple(fields.values()))
+
+    def update(self, job_id, **fields):
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        self._execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id):
+        rows = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    def active(self, result_key):
+        """A queued or running job producing ``result_key``, if any."""
+        rows = self._execute(
+            "SELECT * FROM jobs WHERE result_key = ? AND status IN (?, ?) ORDER BY created_at LIMIT 1",
+            (result_key, QUEUED, RUNNING)
+        )
+        return rows[0] if rows else None
+
+    def recent(self, owner, limit=10):
+        return self._execute(
+            "SELECT * FROM jobs WHERE owner = ? ORDER BY created_at DESC LIMIT ?", (owner, limit)
+        )
+
+    def unfinished(self):
+        return self._execute(
+            "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+        )
+
+
+def score_upload(input_path, key, threshold, workers, on_progress, store=result_store, caches=row_caches):
+    """Score a saved upload into the result store and return its view."""
+    if workers > 1:
+        fd, output_path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        try:
+            score_parallel(input_path, output_path, workers=workers, threshold=threshold,
+                           on_progress=on_progress)
+            return store.save(key, read_chunks(output_path, dtype=SCORED_CSV_DTYPES))
+        finally:
+            os.remove(output_path)
+
+    size = max(os.path.getsize(input_path), 1)
+    row_cache = caches.for_model(registry.version())
+    with open(input_path, "rb") as f:
+        def tracked(chunks):
+            for chunk in chunks:
+                yield chunk
+                on_progress(min(f.tell() / size, 1.0))
+
+        view = store.save(key, tracked(
+            iter_scored_chunks(f, get_pipeline(), threshold=threshold, row_cache=row_cache)
+        ))
+    row_cache.flush()
+    return view
+
+
+class JobQueue:
+    """Runs submitted jobs on a bounded thread pool."""
+
+    def __init__(self, store=None, workers=JOB_WORKERS, jobs_dir=JOBS_DIR):
+        self.store = store or JobStore()
+        self.workers = workers
+        self.jobs_dir = jobs_dir
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="batch-job")
+                # Resume whatever the previous process didn't finish
+                for job in self.store.unfinished():
+                    self._executor.submit(self._run, job["id"])
+            return self._executor
+
+    def submit(self, owner, upload, filename, key, threshold, workers=1, record_kpis=True):
+        """Queue scoring of ``upload`` (a binary file object) and return the job ID.
+
+        If a job for the same result is already queued or running, its ID is
+        returned instead of scoring the file twice. ``record_kpis`` adds the
+        scored rows to the dashboard counters when the job finishes.
+        """
+        pool = self._pool()
+        with self._lock:
+            existing = self.store.active(key)
+            if existing is not None:
+                return existing["id"]
+
+            job_id = uuid.uuid4().hex
+            os.makedirs(self.jobs_dir, exist_ok=True)
+            input_path = os.path.join(self.jobs_dir, f"{job_id}.csv")
+            upload.seek(0)
+            with open(input_path, "wb") as f:
+                for block in iter(lambda: upload.read(1 << 20), b""):
+                    f.write(block)
+
+            self.store.create(
+                id=job_id, owner=owner, filename=filename, input_path=input_path,
+                result_key=key, threshold=threshold, workers=workers,
+                record_kpis=int(record_kpis), status=QUEUED, created_at=time.time()
+            )
+        pool.submit(self._run, job_id)
+        return job_id
+
+    def get(self, job_id):
+        self._pool()
+        return self.store.get(job_id)
+
+    def recent(self, owner, limit=10):
+        self._pool()
+        return self.store.recent(owner, limit)
+
+    def _run(self, job_id):
+        job = self.store.get(job_id)
+        if job is None or job["status"] not in (QUEUED, RUNNING):
+            return
+        self.store.update(job_id, status=RUNNING, started_at=time.time(), progress=0.0)
+
+        last_update = 0.0
+
+        def on_progress(fraction):
+            nonlocal last_update
+            now = time.monotonic()
+            if fraction is not None and now - last_update >= PROGRESS_INTERVAL_SECONDS:
+                self.store.update(job_id, progress=fraction)
+                last_update = now
+
+        try:
+            view = score_upload(job["input_path"], job["result_key"], job["threshold"],
+                                job["workers"], on_progress)
+            if job["record_kpis"]:
+                kpis.record_predictions(view.scored, view.flagged(job["threshold"]), view.probability_sum,
+                                       view.drift)
+            self.store.update(job_id, status=DONE, progress=1.0, rows=view.rows, finished_at=time.time())
+        except Exception as e:
+            self.store.update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+        finally:
+            try:
+                os.remove(job["input_path"])
+            except FileNotFoundError:
+                pass
+
+
+jobs = JobQueue()
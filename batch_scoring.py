@@ -0,0 +1,100 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import columnar
+import risk_rules
+import schema
+from instrumentation import span
+from scoring import DEFAULT_THRESHOLD, FACTOR_COLUMNS, apply_threshold, top_factors
+
+
+CSV_DTYPES = schema.CSV_DTYPES
+
+# Integral values parsed as float64 are written back as "41", not "41.0"
+CSV_FLOAT_FORMAT = "%.15g"
+
+# Columns score_frame adds to every scored frame
+OUTPUT_COLUMNS = ["Prediction", "Attrition Probability", *FACTOR_COLUMNS,
+                  risk_rules.RISK_COLUMN, risk_rules.ACTION_COLUMN, schema.ERROR_COLUMN]
+
+# Reading scored CSVs back: the added text columns stay text even in a
+# chunk where they are all blank (e.g. no invalid rows)
+SCORED_CSV_DTYPES = {**CSV_DTYPES, **{column: object for column in OUTPUT_COLUMNS
+                                      if column != "Attrition Probability"}}
+
+INVALID_LABEL = "Invalid Input"
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def score_frame(df, pipeline, threshold=DEFAULT_THRESHOLD, row_cache=None):
+    """Score one frame in place, adding the prediction, explanation and risk-rule columns.
+
+    The "Top Factor" columns name the features that pushed each employee's
+    score up the most, from the model's own feature contributions (see
+    ``ScoringPipeline.contributions``); they are left empty for models that
+    can't be decomposed.
+
+    Rows failing schema validation (see schema.py) aren't scored: they get
+    the ``INVALID_LABEL`` prediction, no probability and no risk factors,
+    and the reason in the validation column. With a ``row_cache`` (see
+    row_cache.py) only employees that are new or changed since an earlier
+    upload go through the model.
+    """
+    with span("schema.validate"):
+        valid, errors = schema.validate(df)
+    all_valid = valid.all()
+    scored = df if all_valid else df[valid]
+
+    probability = np.full(len(df), np.nan)
+    factors = [np.full(len(df), "", dtype=object) for _ in FACTOR_COLUMNS]
+    if len(scored):
+        features = pipeline.prepare(scored)
+        if row_cache is None:
+            probability[valid] = pipeline.predict_proba(features)
+        else:
+            probability[valid] = row_cache.score(scored, pipeline, features)
+        if pipeline.is_explainable:
+            for column, names in zip(factors, top_factors(pipeline.contributions(features))):
+                column[valid] = names
+
+    df["Prediction"] = np.where(
+        apply_threshold(probability, threshold) == 1,
+        "Likely to Leave",
+        "Likely to Stay"
+    )
+
+    df["Attrition Probability"] = (probability * 100).round(2)
+    for column, names in zip(FACTOR_COLUMNS, factors):
+        df[column] = names
+
+    risk_rules.annotate(df)
+    if not all_valid:
+        df.loc[~valid, "Prediction"] = INVALID_LABEL
+        df.loc[~valid, [risk_rules.RISK_COLUMN, risk_rules.ACTION_COLUMN]] = ""
+    # Added last, so the columns come out in OUTPUT_COLUMNS order
+    df[schema.ERROR_COLUMN] = errors
+    return df
+
+
+def read_chunks(source, chunksize=DEFAULT_CHUNK_SIZE, dtype=CSV_DTYPES):
+    """Iterate over a CSV (path or file object) or columnar dataset in chunks."""
+    if isinstance(source, (str, os.PathLike)) and columnar.is_columnar(source):
+        return columnar.ColumnarDataset(source).iter_chunks(chunksize=chunksize)
+    return pd.read_csv(source, chunksize=chunksize, dtype=dtype)
+
+
+def iter_scored_chunks(source, pipeline, chunksize=DEFAULT_CHUNK_SIZE,
+                       threshold=DEFAULT_THRESHOLD, row_cache=None):
+    is_columnar = isinstance(source, (str, os.PathLike)) and columnar.is_columnar(source)
+    read_span = "columnar.read" if is_columnar else "pd.read_csv"
+    chunks = iter(read_chunks(source, chunksize))
+    while True:
+        with span(read_span):
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        yield score_frame(chunk, pipeline, threshold, row_cache)
+
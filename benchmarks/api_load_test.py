@@ -0,0 +1,119 @@
+"""Closed-loop load test for the scoring API.
+
+Start the service first, e.g. ``uvicorn api:app --workers 4``, then::
+
+    python benchmarks/api_load_test.py --url http://127.0.0.1:8000 --concurrency 64
+
+Uses only the standard library (keep-alive HTTP/1.1 over asyncio streams)
+so the client itself isn't the bottleneck being measured.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from urllib.parse import urlparse
+
+
+def _employee(rng):
+    return {
+        "Age": rng.randint(18, 60),
+        "MonthlyIncome": rng.randint(1000, 20000),
+        "TotalWorkingYears": rng.randint(0, 40),
+        "YearsAtCompany": rng.randint(0, 40),
+        "JobSatisfaction": rng.randint(1, 4),
+        "WorkLifeBalance": rng.randint(1, 4),
+        "EnvironmentSatisfaction": rng.randint(1, 4),
+        "OverTime": rng.choice(["Yes", "No"])
+    }
+
+
+def _request(host, path, body):
+    payload = json.dumps(body).encode("utf-8")
+    head = (
+        f"POST {path} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        "\r\n"
+    )
+    return head.encode("ascii") + payload
+
+
+async def _read_response(reader):
+    status = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status.split()[1])
+
+
+async def _client(url, path, batch_size, deadline, latencies, errors, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    try:
+        while time.perf_counter() < deadline:
+            if batch_size == 1:
+                body = _employee(rng)
+            else:
+                body = {"records": [_employee(rng) for _ in range(batch_size)]}
+            start = time.perf_counter()
+            writer.write(_request(url.netloc, path, body))
+            await writer.drain()
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def _percentile(values, q):
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+async def run(url, concurrency, seconds, batch_size):
+    url = urlparse(url)
+    path = "/predict" if batch_size == 1 else "/predict/batch"
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + seconds
+    await asyncio.gather(*(
+        _client(url, path, batch_size, deadline, latencies, errors, seed)
+        for seed in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rows_per_request": batch_size,
+        "requests_per_second": len(latencies) / elapsed,
+        "rows_per_second": len(latencies) * batch_size / elapsed,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="Records per request; 1 uses /predict, more uses /predict/batch")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.url, args.concurrency, args.seconds, args.batch_size))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""Offline benchmark suite for the scoring, batch and insights paths.
+
+    python benchmarks/run_benchmarks.py --sizes 1000,100000,1000000
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/abc1234.json
+
+Synthetic inputs (see synthetic.py) are generated once per size under
+benchmarks/.data/. Memory-sensitive measurements run in a fresh process
+each so their peak RSS isn't polluted by earlier runs. Results are written
+as JSON (by default to benchmarks/results/<commit>.json) so runs from
+different commits can be diffed with --baseline.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import synthetic  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory isn't reported
+    resource = None
+
+
+DATA_DIR = os.path.join(BENCH_DIR, ".data")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def _proc_status_mb(field):
+    # Linux only; VmHWM (peak RSS) can be reset, unlike ru_maxrss which
+    # also survives the exec of a spawned child
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb():
+    peak = _proc_status_mb("VmHWM")
+    if peak is not None or resource is None:
+        return peak
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _in_child(fn, *args):
+    """Run ``fn`` in a fresh process and add its peak memory to the result."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(1, mp_context=context) as pool:
+        return pool.submit(_measure, fn, *args).result()
+
+
+def _measure(fn, *args):
+    import warnings
+    warnings.filterwarnings("ignore")
+    _reset_peak_rss()
+    before = _proc_status_mb("VmRSS") or _peak_rss_mb()
+    result = fn(*args)
+    after = _peak_rss_mb()
+    if after is not None:
+        result["peak_rss_mb"] = round(after, 1)
+        result["peak_rss_delta_mb"] = round(after - before, 1)
+    return result
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return {
+        "p50_us": round(samples[len(samples) // 2] * 1e6, 2),
+        "p99_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6, 2)
+    }
+
+
+# ---------------- BENCHMARKS ---------------- #
+def bench_load():
+    start = time.perf_counter()
+    import joblib
+    import sklearn  # noqa: F401
+    imports = time.perf_counter() - start
+
+    from model_registry import FEATURES_PATH, MODEL_PATH, SCALER_PATH, ModelRegistry
+
+    registry = ModelRegistry()
+    start = time.perf_counter()
+    registry.get(MODEL_PATH)
+    registry.get(SCALER_PATH)
+    cold = time.perf_counter() - start
+
+    warm = []
+    for _ in range(20):
+        start = time.perf_counter()
+        joblib.load(MODEL_PATH)
+        joblib.load(SCALER_PATH)
+        warm.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    registry.pipeline()
+    pipeline_build = time.perf_counter() - start
+
+    cached = []
+    for _ in range(1000):
+        start = time.perf_counter()
+        registry.get(MODEL_PATH)
+        registry.get(SCALER_PATH)
+        cached.append(time.perf_counter() - start)
+
+    return {
+        "import_ms": round(imports * 1000, 2),
+        "cold_load_ms": round(cold * 1000, 2),
+        "warm_load_ms": round(statistics.median(warm) * 1000, 3),
+        "pipeline_build_ms": round(pipeline_build * 1000, 3),
+        "registry_hit_us": round(statistics.median(cached) * 1e6, 2),
+        "features_artifact": os.path.basename(FEATURES_PATH)
+    }
+
+
+def bench_login_paint():
+    # Cold start as the autoscaler sees it: streamlit is already imported by
+    # the server, then the first script run has to render the login screen
+    from streamlit.testing.v1 import AppTest
+
+    heavy = ("pandas", "sklearn", "scipy", "joblib", "matplotlib")
+    # synthetic.py has already pulled pandas into this process
+    preloaded = set(sys.modules)
+    start = time.perf_counter()
+    app = AppTest.from_file(os.path.join(BASE_DIR, "app.py"), default_timeout=60).run()
+    elapsed = time.perf_counter() - start
+    assert not app.exception, app.exception
+    return {
+        "first_paint_ms": round(elapsed * 1000, 1),
+        "script_ms": round(app.session_state.last_rerun_seconds * 1000, 1),
+        "heavy_modules_loaded": sorted(m for m in heavy if m in sys.modules and m not in preloaded)
+    }
+
+
+def bench_single(iterations=2000):
+    import numpy as np
+
+    import risk_rules
+    from model_registry import get_model, get_pipeline, get_scaler
+    from scoring import FEATURES
+
+    pipeline = get_pipeline()
+    model, scaler = get_model(), get_scaler()
+    row = np.array([[30, 5000, 5, 3, 3, 3, 3, 1]], dtype=np.float64)
+
+    def timed(fn):
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        return _percentiles(samples)
+
+    return {
+        "iterations": iterations,
+        "pipeline_predict": timed(lambda: pipeline.predict_proba(row)),
+        "sklearn_transform_predict_proba": timed(lambda: model.predict_proba(scaler.transform(row))),
+        "prediction_page_path": timed(lambda: (
+            pipeline.predict_proba(row),
+            risk_rules.for_record(dict(zip(FEATURES, row[0])))
+        ))
+    }
+
+
+def bench_batch(csv_path, rows):
+    # The Batch Prediction job path: parse, score, columnar result and
+    # row orders, into an empty result store and row cache
+    from batch_jobs import score_upload
+    from model_registry import get_pipeline
+    from result_store import ResultStore
+    from row_cache import RowCacheStore
+    from scoring import DEFAULT_THRESHOLD
+
+    get_pipeline()
+    with tempfile.TemporaryDirectory() as root:
+        store = ResultStore(os.path.join(root, "results"))
+        caches = RowCacheStore(os.path.join(root, "rows"))
+        start = time.perf_counter()
+        view = score_upload(csv_path, "bench", DEFAULT_THRESHOLD, 1, lambda fraction: None,
+                            store=store, caches=caches)
+        elapsed = time.perf_counter() - start
+        scored = view.rows
+    assert scored == rows, (scored, rows)
+    return {
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed)
+    }
+
+
+def bench_parse(csv_path, cols_path, mode):
+    import pandas as pd
+
+    import columnar
+    from insights import INSIGHT_COLUMNS
+
+    start = time.perf_counter()
+    if mode == "csv_full":
+        df = pd.read_csv(csv_path)
+    elif mode == "csv_usecols":
+        df = pd.read_csv(csv_path, usecols=INSIGHT_COLUMNS)
+    else:
+        df = columnar.ColumnarDataset(cols_path).read(INSIGHT_COLUMNS)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": round(elapsed, 4),
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 1024 / 1024, 2)
+    }
+
+
+def bench_insights(cols_path):
+    import columnar
+    import insights
+
+    df = columnar.ColumnarDataset(cols_path).read(insights.INSIGHT_COLUMNS)
+    start = time.perf_counter()
+    aggregates = insights.compute_aggregates(df)
+    aggregate_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    insights.render_figures(aggregates)
+    render_seconds = time.perf_counter() - start
+    return {
+        "aggregate_seconds": round(aggregate_seconds, 4),
+        "render_seconds": round(render_seconds, 4)
+    }
+
+
+# ---------------- RUNNER ---------------- #
+def _prepare_inputs(rows, seed):
+    import columnar
+
+    csv_path = synthetic.write_csv(os.path.join(DATA_DIR, f"employees-{rows}-{seed}.csv"), rows, seed)
+    cols_path = os.path.join(DATA_DIR, f"employees-{rows}-{seed}.cols")
+    if not columnar.is_columnar(cols_path):
+        columnar.ingest_csv(csv_path, cols_path)
+    return csv_path, cols_path
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(sizes, seed, log=print):
+    results = []
+
+    def record(name, size, result):
+        results.append({"name": name, "size": size, **result})
+        log(f"{name:<28} {str(size or ''):>10}  {json.dumps(result)}")
+
+    record("login_paint", None, _in_child(bench_login_paint))
+    record("load", None, _in_child(bench_load))
+    record("single_record", None, _in_child(bench_single))
+
+    for rows in sizes:
+        csv_path, cols_path = _prepare_inputs(rows, seed)
+        batch = _in_child(bench_batch, csv_path, rows)
+        batch["input_mb"] = round(os.path.getsize(csv_path) / 1024 / 1024, 2)
+        record("batch_upload", rows, batch)
+        for mode in ("csv_full", "csv_usecols", "columnar"):
+            record(f"parse_{mode}", rows, _in_child(bench_parse, csv_path, cols_path, mode))
+        record("insights", rows, _in_child(bench_insights, cols_path))
+
+    return results
+
+
+def _flatten(result, prefix=""):
+    flat = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) \
+                and key not in ("size", "iterations"):
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(baseline, results, log=print):
+    """Print the relative change of every numeric metric against ``baseline``."""
+    old = {(r["name"], r["size"]): _flatten(r) for r in baseline["results"]}
+    log(f"\nChange vs {baseline['meta'].get('commit', '?')} (negative is faster/smaller):")
+    for result in results:
+        previous = old.get((result["name"], result["size"]))
+        if previous is None:
+            continue
+        for metric, value in _flatten(result).items():
+            before = previous.get(metric)
+            if before:
+                log(f"  {result['name']:<24} {str(result['size'] or ''):>10} "
+                    f"{metric:<40} {before:>12} -> {value:<12} ({(value - before) / before:+.1%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated synthetic row counts (up to 10000000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON results path (default: results/<commit>.json)")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    commit = _git_commit()
+    results = run(sizes, args.seed)
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": sizes,
+            "seed": args.seed
+        },
+        "results": results
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
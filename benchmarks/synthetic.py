@@ -0,0 +1,42 @@
+"""Synthetic employee data shaped like HR-Employee-Attrition.csv.
+
+Each column is sampled independently from its observed values in the real
+dataset, so dtypes, ranges and category frequencies match while the row
+count can be anything from a thousand to tens of millions.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_PATH = os.path.join(BASE_DIR, "HR-Employee-Attrition.csv")
+
+GENERATE_CHUNK_ROWS = 500_000
+
+
+def generate(rows, seed=0, source=SOURCE_PATH):
+    """Yield synthetic frames totalling ``rows`` rows, deterministically for ``seed``."""
+    template = pd.read_csv(source)
+    rng = np.random.default_rng(seed)
+    columns = {col: template[col].to_numpy() for col in template.columns}
+
+    remaining = rows
+    while remaining > 0:
+        n = min(remaining, GENERATE_CHUNK_ROWS)
+        yield pd.DataFrame({col: rng.choice(values, size=n) for col, values in columns.items()})
+        remaining -= n
+
+
+def write_csv(path, rows, seed=0):
+    """Write a synthetic CSV (reused if it already exists) and return its path."""
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        for i, chunk in enumerate(generate(rows, seed)):
+            chunk.to_csv(f, index=False, header=(i == 0))
+    os.replace(tmp_path, path)
+    return path
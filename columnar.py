@@ -0,0 +1,251 @@
+"""Columnar, memory-mappable dataset store.
+
+A dataset is a directory holding one ``.npy`` file per column plus a
+``schema.json``. Integer columns are narrowed to the smallest dtype that
+fits (int8 for the 1-4 satisfaction scales), text columns are stored as
+category codes, and columns are memory-mapped lazily so a page that needs
+four columns never touches the other thirty.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+SCHEMA_FILE = "schema.json"
+INGEST_CHUNK_SIZE = 100_000
+
+
+def _narrow_int(values):
+    if len(values) == 0:
+        return values.astype(np.int8)
+    low, high = values.min(), values.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values.astype(np.int64)
+
+
+def _codes_dtype(count):
+    for dtype in (np.int8, np.int16, np.int32):
+        if count < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class _ColumnBuilder:
+    """Writes one column chunk by chunk, keeping only its metadata in memory.
+
+    Each chunk is spilled to its own small ``.npy`` part as soon as it
+    arrives. The final dtype (narrowest int, float, or category codes) is
+    only known once every chunk has been seen, so ``finish`` streams the
+    parts into the column file in that dtype.
+    """
+
+    def __init__(self, spill_dir, name):
+        self.spill_dir = spill_dir
+        self.name = name
+        # (part path, or None for an all-blank chunk; length)
+        self.parts = []
+        self.rows = 0
+        self.categories = None
+        self.kind = None
+        self.low = None
+        self.high = None
+
+    def _spill(self, part):
+        path = os.path.join(self.spill_dir, f"{self.name}-{len(self.parts):06d}.npy")
+        np.save(path, part)
+        self.parts.append((path, len(part)))
+        self.rows += len(part)
+
+    def add(self, values):
+        if self.kind is not None and values.isna().all():
+            # An all-blank chunk parses as float whatever the column holds
+            if self.kind != "category":
+                self.kind = "float"
+            self.parts.append((None, len(values)))
+            self.rows += len(values)
+            return
+
+        if pd.api.types.is_integer_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            kind = "int"
+        elif pd.api.types.is_numeric_dtype(values):
+            kind = "float"
+        else:
+            kind = "category"
+
+        # A column seen as int in one chunk and float in the next (e.g. a
+        # chunk with blanks) becomes float; anything mixed with text, such
+        # as a column left blank for a whole chunk, is stored as text
+        if self.kind is None or self.kind == kind:
+            self.kind = kind
+        elif {self.kind, kind} == {"int", "float"}:
+            self.kind = "float"
+        elif self.kind != "category":
+            self._to_category()
+
+        if self.kind == "category":
+            part = self._codes(values)
+        elif kind == "int":
+            part = _narrow_int(values.to_numpy())
+            if len(part):
+                low, high = int(part.min()), int(part.max())
+                self.low = low if self.low is None else min(self.low, low)
+                self.high = high if self.high is None else max(self.high, high)
+        else:
+            part = values.to_numpy(dtype=np.float64)
+        self._spill(part)
+
+    def _codes(self, values):
+        if self.categories is None:
+            self.categories = {}
+        strings = values.astype(object).where(values.notna(), None)
+        for value in pd.unique(strings):
+            if value is not None and value not in self.categories:
+                self.categories[value] = len(self.categories)
+        return strings.map(self.categories).fillna(-1).to_numpy(dtype=np.int32)
+
+    def _to_category(self):
+        # Re-encode the numeric parts already spilled as category codes
+        self.kind = "category"
+        for path, _ in self.parts:
+            if path is not None:
+                np.save(path, self._codes(pd.Series(np.load(path))))
+
+    def finish(self, path):
+        """Write the column to ``path``; returns its dtype and categories."""
+        if self.kind == "category":
+            dtype, fill = np.dtype(_codes_dtype(len(self.categories))), -1
+        elif self.kind == "float":
+            dtype, fill = np.dtype(np.float64), np.nan
+        else:
+            dtype, fill = _narrow_int(np.array([self.low or 0, self.high or 0])).dtype, 0
+
+        with open(path, "wb") as f:
+            np.lib.format.write_array_header_1_0(f, {
+                "descr": np.lib.format.dtype_to_descr(dtype),
+                "fortran_order": False,
+                "shape": (self.rows,)
+            })
+            for part_path, length in self.parts:
+                if part_path is None:
+                    np.full(length, fill, dtype=dtype).tofile(f)
+                else:
+                    np.load(part_path).astype(dtype).tofile(f)
+                    os.remove(part_path)
+
+        categories = list(self.categories) if self.kind == "category" else None
+        return ("category" if categories is not None else dtype.name), categories
+
+
+def ingest_csv(source, dest, chunksize=INGEST_CHUNK_SIZE):
+    """Convert a CSV (path or file object) into a columnar dataset at ``dest``.
+
+    The CSV is parsed and written in chunks, so peak memory is about one
+    chunk rather than the size of the file. ``dest`` is replaced atomically.
+    """
+    return write_frames(pd.read_csv(source, chunksize=chunksize), dest)
+
+
+def write_frames(frames, dest):
+    """Write an iterable of frames with the same columns as one columnar dataset.
+
+    Chunks are written out as they arrive, so memory stays at about one
+    chunk however many rows there are. ``dest`` is replaced atomically.
+    """
+    parent = os.path.dirname(os.path.abspath(dest))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".ingest-")
+    try:
+        spill_dir = os.path.join(tmp_dir, "parts")
+        os.makedirs(spill_dir)
+        builders = {}
+        rows = 0
+        for chunk in frames:
+            for column in chunk.columns:
+                if column not in builders:
+                    builders[column] = _ColumnBuilder(spill_dir, f"{len(builders):03d}")
+                builders[column].add(chunk[column])
+            rows += len(chunk)
+
+        schema = {"rows": rows, "columns": {}}
+        for i, (column, builder) in enumerate(builders.items()):
+            file_name = f"{i:03d}.npy"
+            dtype, categories = builder.finish(os.path.join(tmp_dir, file_name))
+            schema["columns"][column] = {"file": file_name, "dtype": dtype, "categories": categories}
+        os.rmdir(spill_dir)
+        with open(os.path.join(tmp_dir, SCHEMA_FILE), "w", encoding="utf-8") as f:
+            json.dump(schema, f)
+
+        if os.path.isdir(dest):
+            shutil.rmtree(dest)
+        os.replace(tmp_dir, dest)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return ColumnarDataset(dest)
+
+
+def is_columnar(path):
+    return os.path.isfile(os.path.join(path, SCHEMA_FILE))
+
+
+class ColumnarDataset:
+    """Read-only view of a columnar dataset; columns are mapped on demand."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, SCHEMA_FILE), encoding="utf-8") as f:
+            schema = json.load(f)
+        self.rows = schema["rows"]
+        self.schema = schema["columns"]
+        self._arrays = {}
+
+    @property
+    def columns(self):
+        return list(self.schema)
+
+    def array(self, column):
+        """Raw memory-mapped values (category codes for text columns)."""
+        if column not in self._arrays:
+            spec = self.schema[column]
+            self._arrays[column] = np.load(os.path.join(self.path, spec["file"]), mmap_mode="r")
+        return self._arrays[column]
+
+    def _series(self, column, values):
+        spec = self.schema[column]
+        if spec["dtype"] == "category":
+            return pd.Series(pd.Categorical.from_codes(values, spec["categories"]), name=column)
+        return pd.Series(values, name=column, copy=False)
+
+    def column(self, column, start=0, stop=None):
+        return self._series(column, self.array(column)[start:stop])
+
+    def category_code(self, column, value):
+        """Code of ``value`` in a text column, or None if it never occurs."""
+        categories = self.schema[column]["categories"] or []
+        return categories.index(value) if value in categories else None
+
+    def read(self, columns=None, start=0, stop=None):
+        """Load ``columns`` (all by default) for rows ``start:stop`` as a frame."""
+        columns = self.columns if columns is None else [c for c in columns if c in self.schema]
+        data = {column: self.column(column, start, stop) for column in columns}
+        return pd.DataFrame(data, copy=False)
+
+    def take(self, indices, columns=None):
+        """Load ``columns`` for the rows at ``indices``, in that order.
+
+        Only the requested rows are read from the memory-mapped files.
+        """
+        columns = self.columns if columns is None else [c for c in columns if c in self.schema]
+        data = {column: self._series(column, self.array(column)[indices]) for column in columns}
+        return pd.DataFrame(data, copy=False)
+
+    def iter_chunks(self, columns=None, chunksize=INGEST_CHUNK_SIZE):
+        for start in range(0, self.rows, chunksize):
+            yield self.read(columns, start, start + chunksize)
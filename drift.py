@@ -0,0 +1,132 @@
+"""Input and score drift between batch uploads and the training data.
+
+Every feature and the predicted probability are summarized as a histogram
+over fixed bin edges, so summaries of different uploads merge by adding
+their counts. Each stored result keeps the summary of its own rows (see
+result_store.py); recording an upload adds it to the running totals in
+the KPI store, and the Dashboard compares those totals with the same
+summary of ``HR-Employee-Attrition.csv`` using PSI and a binned KS
+statistic. Nothing already uploaded is ever read again.
+"""
+import numpy as np
+import pandas as pd
+
+from schema import FIELDS
+from scoring import FEATURES, encode_overtime
+
+
+PROBABILITY = "Probability"
+
+# Left bin edges, plus the end of the last bin. Integer features get one bin
+# per value or a few values; everything above 20,000 MonthlyIncome shares a
+# bin. No training salary reaches 20,000, so that bin is empty in the
+# baseline and any upload mass in it already shows as drift; finer bins
+# there would only split it between bins the baseline never fills
+BIN_EDGES = {
+    "Age": np.arange(FIELDS["Age"].min, FIELDS["Age"].max + 4, 3),
+    "MonthlyIncome": np.append(np.arange(FIELDS["MonthlyIncome"].min, 20_001, 1000),
+                               FIELDS["MonthlyIncome"].max + 1),
+    "TotalWorkingYears": np.arange(FIELDS["TotalWorkingYears"].min, FIELDS["TotalWorkingYears"].max + 3, 2),
+    "YearsAtCompany": np.arange(FIELDS["YearsAtCompany"].min, FIELDS["YearsAtCompany"].max + 3, 2),
+    "JobSatisfaction": np.arange(FIELDS["JobSatisfaction"].min, FIELDS["JobSatisfaction"].max + 2),
+    "WorkLifeBalance": np.arange(FIELDS["WorkLifeBalance"].min, FIELDS["WorkLifeBalance"].max + 2),
+    "EnvironmentSatisfaction": np.arange(
+        FIELDS["EnvironmentSatisfaction"].min, FIELDS["EnvironmentSatisfaction"].max + 2
+    ),
+    "OverTime": np.array([0, 1, 2]),
+    PROBABILITY: np.linspace(0, 1, 21)
+}
+
+# Conventional PSI bands: below 0.1 stable, 0.1-0.25 shifting, above drifted
+PSI_WARNING = 0.1
+PSI_ALERT = 0.25
+
+# Empty bins are smoothed to this proportion so PSI stays finite
+PSI_EPSILON = 1e-4
+
+
+def histogram(values, edges):
+    """Counts of ``values`` per bin; NaN is skipped and outliers go to the end bins."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    bins = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, len(edges) - 2)
+    return np.bincount(bins, minlength=len(edges) - 1)
+
+
+def summarize(df, probability):
+    """Histogram summary of the rows of ``df`` with a finite ``probability`` (0-1).
+
+    ``df`` holds the feature columns as uploaded (OverTime as Yes/No or
+    0/1). The result is plain JSON: ``{"rows": n, name: [counts], ...}``.
+    """
+    probability = np.asarray(probability, dtype=np.float64)
+    scored = np.isfinite(probability)
+    summary = {"rows": int(scored.sum())}
+    for feature in FEATURES:
+        values = df[feature]
+        if feature == "OverTime":
+            values = encode_overtime(values)
+        values = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        summary[feature] = histogram(values[scored], BIN_EDGES[feature]).tolist()
+    summary[PROBABILITY] = histogram(probability[scored], BIN_EDGES[PROBABILITY]).tolist()
+    return summary
+
+
+def _proportions(counts):
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    return counts / total if total else counts
+
+
+def psi(expected, actual):
+    """Population stability index of ``actual`` counts against ``expected``."""
+    e = np.maximum(_proportions(expected), PSI_EPSILON)
+    a = np.maximum(_proportions(actual), PSI_EPSILON)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def ks(expected, actual):
+    """Kolmogorov-Smirnov statistic between two binned distributions."""
+    return float(np.max(np.abs(np.cumsum(_proportions(expected)) - np.cumsum(_proportions(actual)))))
+
+
+def status(value):
+    if value >= PSI_ALERT:
+        return "🔴 Drifted"
+    if value >= PSI_WARNING:
+        return "🟡 Shifting"
+    return "🟢 Stable"
+
+
+def compare(baseline, observed):
+    """PSI, KS and status per feature and for the probability, where observed."""
+    names = [name for name in FEATURES + [PROBABILITY] if name in observed]
+    values = [psi(baseline[name], observed[name]) for name in names]
+    return pd.DataFrame({
+        "Feature": names,
+        "PSI": values,
+        "KS": [ks(baseline[name], observed[name]) for name in names],
+        "Status": [status(value) for value in values]
+    })
+
+
+def bin_labels(name):
+    """Readable labels for the bins of ``name``."""
+    edges = BIN_EDGES[name]
+    if name == "OverTime":
+        return ["No", "Yes"]
+    if name == PROBABILITY:
+        return [f"{start:.0%}–{stop:.0%}" for start, stop in zip(edges[:-1], edges[1:])]
+    labels = [f"{start:g}" if stop - start == 1 else f"{start:g}–{stop - 1:g}"
+              for start, stop in zip(edges[:-1], edges[1:])]
+    if name == "MonthlyIncome":
+        labels[-1] = f"{edges[-2]:g}+"
+    return labels
+
+
+def distributions(baseline, observed, name):
+    """Share of rows per bin of ``name`` in the baseline and the uploads."""
+    return pd.DataFrame(
+        {"Training data": _proportions(baseline[name]), "Uploads": _proportions(observed[name])},
+        index=pd.Index(bin_labels(name), name=name)
+    )
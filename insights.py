@@ -0,0 +1,166 @@
+import hashlib
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import columnar
+from instrumentation import span
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.path.join(BASE_DIR, "HR-Employee-Attrition.csv")
+
+COLUMNAR_DIR = os.path.join(BASE_DIR, "data", "columnar")
+
+# Columns the Data Insights charts use; only these are mapped from disk
+INSIGHT_COLUMNS = ["Attrition", "Department", "Age", "MonthlyIncome"]
+
+HISTOGRAM_BINS = 20
+KDE_POINTS = 200
+
+# KDE cost grows with rows x points; above this many rows fit it on a
+# fixed random sample, which doesn't visibly change the curve
+KDE_MAX_SAMPLES = 20_000
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _DatasetCache:
+    """Columnar copy of the dataset and its content hash, shared across sessions.
+
+    The CSV is hashed and converted to the columnar store only when its
+    mtime or size changes; after that pages map just the columns they use.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, path):
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1], entry[2]
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != stamp:
+                digest = _file_hash(path)
+                dest = os.path.join(COLUMNAR_DIR, digest[:16])
+                if columnar.is_columnar(dest):
+                    dataset = columnar.ColumnarDataset(dest)
+                else:
+                    with span("dataset.ingest"):
+                        dataset = columnar.ingest_csv(path, dest)
+                entry = (stamp, digest, dataset)
+                self._entries[path] = entry
+            return entry[1], entry[2]
+
+
+_datasets = _DatasetCache()
+
+
+def get_dataset(columns=None, path=DATASET_PATH):
+    """Load ``columns`` (all by default) of the employee dataset."""
+    return _datasets.get(path)[1].read(columns)
+
+
+def dataset_hash(path=DATASET_PATH):
+    return _datasets.get(path)[0]
+
+
+def _histogram(values):
+    values = values.to_numpy(dtype=np.float64)
+    counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+
+    # Gaussian KDE scaled to counts, matching seaborn's histplot(kde=True)
+    from scipy.stats import gaussian_kde
+    sample = values
+    if len(values) > KDE_MAX_SAMPLES:
+        sample = np.random.default_rng(0).choice(values, KDE_MAX_SAMPLES, replace=False)
+    xs = np.linspace(edges[0], edges[-1], KDE_POINTS)
+    ys = gaussian_kde(sample)(xs) * len(values) * (edges[1] - edges[0])
+
+    return {"counts": counts, "edges": edges, "kde_x": xs, "kde_y": ys}
+
+
+def compute_aggregates(df):
+    """Everything the Data Insights charts need, without the raw rows."""
+    with span("insights.aggregates"):
+        return _aggregates(df)
+
+
+def _aggregates(df):
+    return {
+        "attrition": df["Attrition"].value_counts(sort=False),
+        "department": pd.crosstab(df["Department"], df["Attrition"]),
+        "age": _histogram(df["Age"]),
+        "income": _histogram(df["MonthlyIncome"])
+    }
+
+
+def _png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def _histogram_figure(Figure, hist, xlabel):
+    fig = Figure()
+    ax = fig.subplots()
+    ax.stairs(hist["counts"], hist["edges"], fill=True, alpha=0.5, color="C0")
+    ax.plot(hist["kde_x"], hist["kde_y"], color="C0")
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Count")
+    return _png(fig)
+
+
+def render_figures(aggregates):
+    """Render the four insight charts from precomputed aggregates as PNG bytes."""
+    with span("insights.render"):
+        return _render(aggregates)
+
+
+def _render(aggregates):
+    # Figure objects don't touch pyplot's global state, so concurrent
+    # sessions can render safely
+    from matplotlib.figure import Figure
+
+    figures = {}
+
+    fig = Figure()
+    ax = fig.subplots()
+    counts = aggregates["attrition"]
+    ax.bar(counts.index.astype(str), counts.to_numpy(), color=["C0", "C1"][:len(counts)])
+    ax.set_xlabel("Attrition")
+    ax.set_ylabel("count")
+    figures["attrition"] = _png(fig)
+
+    fig = Figure()
+    ax = fig.subplots()
+    table = aggregates["department"]
+    width = 0.8 / max(len(table.columns), 1)
+    positions = np.arange(len(table.index))
+    for i, column in enumerate(table.columns):
+        ax.bar(positions + (i - (len(table.columns) - 1) / 2) * width,
+               table[column].to_numpy(), width, label=str(column))
+    ax.set_xticks(positions, table.index.astype(str), rotation=45)
+    ax.set_xlabel("Department")
+    ax.set_ylabel("count")
+    ax.legend(title="Attrition")
+    figures["department"] = _png(fig)
+
+    figures["age"] = _histogram_figure(Figure, aggregates["age"], "Age")
+    figures["income"] = _histogram_figure(Figure, aggregates["income"], "MonthlyIncome")
+
+    return figures
@@ -0,0 +1,148 @@
+"""Lightweight timing spans aggregated into per-stage histograms.
+
+    with span("predict_proba"):
+        ...
+
+Disabled by default (enable with ``ATTRITION_INSTRUMENTATION=1`` or from
+the admin page); while disabled ``span`` returns a shared no-op context
+manager, so instrumented code pays one function call and a flag check.
+Histograms live in process memory and can be exported in the Prometheus
+text format.
+"""
+import bisect
+import os
+import threading
+import time
+
+
+# Upper bounds in seconds, Prometheus-style (+Inf is implicit)
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+           0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_NAME = "attrition_stage_duration_seconds"
+
+_enabled = os.environ.get("ATTRITION_INSTRUMENTATION", "").lower() in ("1", "true", "yes")
+_lock = threading.Lock()
+_histograms = {}
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BUCKETS[i - 1] if i > 0 else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return BUCKETS[-1]
+
+
+def observe(stage, seconds):
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = _Histogram()
+        histogram.observe(seconds)
+
+
+class _Span:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(stage):
+    """Time the enclosed block under ``stage`` (no-op while disabled)."""
+    if not _enabled:
+        return _NOOP
+    return _Span(stage)
+
+
+def enabled():
+    return _enabled
+
+
+def set_enabled(value):
+    global _enabled
+    _enabled = bool(value)
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def snapshot():
+    """Per-stage summary rows, slowest total time first."""
+    with _lock:
+        rows = [
+            {
+                "stage": stage,
+                "count": h.count,
+                "total_ms": h.sum * 1000,
+                "mean_ms": h.sum / h.count * 1000,
+                "p50_ms": h.quantile(0.5) * 1000,
+                "p95_ms": h.quantile(0.95) * 1000,
+                "p99_ms": h.quantile(0.99) * 1000
+            }
+            for stage, h in _histograms.items() if h.count
+        ]
+    return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+
+def prometheus_text():
+    """All histograms in the Prometheus text exposition format."""
+    lines = [
+        f"# HELP {METRIC_NAME} Time spent in each instrumented stage.",
+        f"# TYPE {METRIC_NAME} histogram"
+    ]
+    with _lock:
+        for stage, h in sorted(_histograms.items()):
+            label = stage.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for bound, n in zip(BUCKETS + (float("inf"),), h.counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{METRIC_NAME}_bucket{{stage="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_sum{{stage="{label}"}} {h.sum}')
+            lines.append(f'{METRIC_NAME}_count{{stage="{label}"}} {h.count}')
+    return "\n".join(lines) + "\n"
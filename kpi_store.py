@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+KPI_PATH = os.path.join(DATA_DIR, "kpi_summary.json")
+
+EMPTY_SUMMARY = {
+    "dataset_hash": None,
+    "employees": 0,
+    "attrition": 0,
+    "scored": 0,
+    "flagged": 0,
+    "probability_sum": 0.0,
+    # Histogram summaries for drift monitoring (see drift.py)
+    "drift_model": None,
+    "drift_dataset": None,
+    "drift_baseline": None,
+    "drift_total": None,
+    "drift_latest": None
+}
+
+
+def _merge_counts(total, summary):
+    # Summaries share fixed bins, so merging is adding counts bin by bin
+    if total is None:
+        return summary
+    merged = {"rows": total["rows"] + summary["rows"]}
+    for name, counts in summary.items():
+        if name != "rows":
+            merged[name] = [a + b for a, b in zip(total.get(name, [0] * len(counts)), counts)]
+    return merged
+
+
+class KpiStore:
+    """Running dashboard counters persisted in a small JSON file.
+
+    Writers add deltas (new batch predictions) instead of recomputing from
+    the full table, and readers only load the summary, so
+    reading the KPIs costs the same however many rows have been seen.
+    """
+
+    def __init__(self, path=KPI_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                summary = json.load(f)
+        except (FileNotFoundError, ValueError):
+            summary = {}
+        return {**EMPTY_SUMMARY, **summary}
+
+    def _update(self, apply):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock, open(self.path + ".lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            summary = self.read()
+            apply(summary)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(summary, f)
+            os.replace(tmp_path, self.path)
+        return summary
+
+    def record_predictions(self, scored, flagged, probability_sum, drift=None):
+        """Add a scored upload; ``drift`` is its histogram summary, if it has one."""
+        def apply(summary):
+            summary["scored"] += int(scored)
+            summary["flagged"] += int(flagged)
+            summary["probability_sum"] += float(probability_sum)
+            if drift is not None and drift["rows"]:
+                summary["drift_total"] = _merge_counts(summary["drift_total"], drift)
+                summary["drift_latest"] = drift
+        return self._update(apply)
+
+    def sync_dataset(self, dataset_hash, employees, attrition):
+        """Reset the employee counters when the reference dataset changes."""
+        def apply(summary):
+            if summary["dataset_hash"] != dataset_hash:
+                summary["dataset_hash"] = dataset_hash
+                summary["employees"] = int(employees)
+                summary["attrition"] = int(attrition)
+        return self._update(apply)
+
+    def sync_drift_baseline(self, model_version, dataset_hash, baseline):
+        """Replace the training baseline when the dataset or model changes.
+
+        Upload feature counts stay valid across models, but their
+        probability counts came from the old model and are dropped.
+        """
+        def apply(summary):
+            model_changed = summary["drift_model"] != model_version
+            summary["drift_model"] = model_version
+            summary["drift_dataset"] = dataset_hash
+            summary["drift_baseline"] = baseline
+            if model_changed:
+                for name in ("drift_total", "drift_latest"):
+                    if summary[name] is not None:
+                        summary[name].pop("Probability", None)
+        return self._update(apply)
+
+
+def rates(summary):
+    """Derived KPI rates, or None where nothing has been counted yet."""
+    def ratio(numerator, denominator):
+        return numerator / denominator if denominator else None
+
+    return {
+        "attrition_rate": ratio(summary["attrition"], summary["employees"]),
+        "flagged_rate": ratio(summary["flagged"], summary["scored"]),
+        "mean_probability": ratio(summary["probability_sum"], summary["scored"])
+    }
+
+
+kpis = KpiStore()
@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+
+from instrumentation import span
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(BASE_DIR, "models", "student_model.joblib")
+SCALER_PATH = os.path.join(BASE_DIR, "models", "scaler.joblib")
+FEATURES_PATH = os.path.join(BASE_DIR, "models", "model_features.joblib")
+MODEL_CARD_PATH = os.path.join(BASE_DIR, "models", "model_card.json")
+
+
+def _stamp(path):
+    # mtime + size is enough to notice a replaced artifact without hashing
+    # the whole file on every Streamlit rerun
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ModelRegistry:
+    """Process-wide cache of joblib artifacts, reloaded when the file changes.
+
+    Loaded objects are shared by every session and must be treated as
+    read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._pipeline = None
+        self.load_seconds = {}
+
+    def get(self, path):
+        stamp = _stamp(path)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+
+            # Imported here so callers that only need version() stay light
+            import joblib
+
+            start = time.perf_counter()
+            with span("joblib.load"):
+                obj = joblib.load(path)
+            self.load_seconds[path] = time.perf_counter() - start
+            self._entries[path] = (stamp, obj)
+            return obj
+
+    def version(self, *paths):
+        # Changes whenever any of the given artifacts is replaced on disk
+        paths = paths or (MODEL_PATH, SCALER_PATH)
+        return "-".join(f"{m:x}.{s:x}" for m, s in map(_stamp, paths))
+
+    def pipeline(self):
+        # Rebuilt (and its schema re-validated) only when an artifact changes
+        version = self.version(MODEL_PATH, SCALER_PATH, FEATURES_PATH)
+        cached = self._pipeline
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        from scoring import ScoringPipeline
+
+        pipeline = ScoringPipeline(
+            self.get(MODEL_PATH),
+            self.get(SCALER_PATH),
+            input_columns=self.get(FEATURES_PATH)
+        )
+        self._pipeline = (version, pipeline)
+        return pipeline
+
+    def total_load_seconds(self):
+        return sum(self.load_seconds.values())
+
+
+registry = ModelRegistry()
+
+
+def get_model():
+    return registry.get(MODEL_PATH)
+
+
+def get_scaler():
+    return registry.get(SCALER_PATH)
+
+
+def get_pipeline():
+    return registry.pipeline()
+
+
+def get_model_card():
+    """The model card written by ``python -m train``, or None if there is none."""
+    try:
+        with open(MODEL_CARD_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
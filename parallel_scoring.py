@@ -0,0 +1,140 @@
+"""Process-pool batch scoring for very large inputs.
+
+The input is split into shards (byte ranges of a CSV, or row ranges of a
+columnar dataset). Each worker parses and scores its own shards, so parsing
+scales with cores too, and writes them to part files that are concatenated
+in input order. Workers load the model artifacts with
+``joblib.load(mmap_mode="r")`` so their arrays are shared through the page
+cache instead of being pickled into every process.
+"""
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import pandas as pd
+
+import columnar
+from batch_scoring import CSV_DTYPES, CSV_FLOAT_FORMAT, OUTPUT_COLUMNS, score_frame
+from model_registry import FEATURES_PATH, MODEL_PATH, SCALER_PATH
+from scoring import DEFAULT_THRESHOLD, ScoringPipeline
+
+
+# CSV shards are byte ranges of about this size; small enough to keep each
+# worker's memory bounded, large enough to amortize task overhead
+CSV_SHARD_BYTES = 32 * 1024 * 1024
+COLUMNAR_SHARD_ROWS = 250_000
+
+_worker_pipeline = None
+
+
+def _init_worker():
+    global _worker_pipeline
+    _worker_pipeline = ScoringPipeline(
+        joblib.load(MODEL_PATH, mmap_mode="r"),
+        joblib.load(SCALER_PATH, mmap_mode="r"),
+        input_columns=joblib.load(FEATURES_PATH)
+    )
+
+
+def _write_part(df, part_path, header):
+    df.to_csv(part_path, index=False, header=header, float_format=CSV_FLOAT_FORMAT)
+    flagged = int((df["Prediction"] == "Likely to Leave").sum())
+    probability_sum = float(df["Attrition Probability"].sum()) / 100
+    return len(df), flagged, probability_sum
+
+
+def _score_csv_shard(path, start, end, names, part_path, threshold):
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    df = pd.read_csv(io.BytesIO(data), header=None, names=names, dtype=CSV_DTYPES)
+    return _write_part(score_frame(df, _worker_pipeline, threshold), part_path, header=False)
+
+
+def _score_columnar_shard(path, start, stop, part_path, threshold):
+    df = columnar.ColumnarDataset(path).read(start=start, stop=stop)
+    return _write_part(score_frame(df, _worker_pipeline, threshold), part_path, header=False)
+
+
+def plan_csv_shards(path, shard_bytes=CSV_SHARD_BYTES):
+    """Split a CSV into newline-aligned ``(start, end)`` byte ranges after the header.
+
+    Assumes no quoted field spans several lines, which holds for HRIS exports.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.readline()
+        start = f.tell()
+        shards = []
+        while start < size:
+            f.seek(min(start + shard_bytes, size))
+            if f.tell() < size:
+                f.readline()
+            end = f.tell()
+            shards.append((start, end))
+            start = end
+    return shards
+
+
+def score_parallel(input_path, output, workers=None, threshold=DEFAULT_THRESHOLD,
+                   shard_bytes=CSV_SHARD_BYTES, shard_rows=COLUMNAR_SHARD_ROWS,
+                   on_progress=None):
+    """Score a CSV file or columnar dataset with a pool of ``workers`` processes.
+
+    ``output`` is a path or a binary file object; the scored CSV is written
+    to it in input order. Returns ``(rows, flagged, probability_sum)``.
+    ``on_progress`` is called with the completed fraction after each shard.
+    """
+    workers = workers or os.cpu_count() or 1
+    is_columnar = columnar.is_columnar(input_path)
+
+    if is_columnar:
+        dataset = columnar.ColumnarDataset(input_path)
+        names = dataset.columns
+        shards = [(start, min(start + shard_rows, dataset.rows))
+                  for start in range(0, dataset.rows, shard_rows)]
+    else:
+        names = list(pd.read_csv(input_path, nrows=0).columns)
+        shards = plan_csv_shards(input_path, shard_bytes)
+
+    # Output columns: the input plus what score_frame adds
+    added = [col for col in OUTPUT_COLUMNS if col not in names]
+    header = pd.DataFrame(columns=names + added)
+
+    # spawn, not fork: safe to start from Streamlit's multi-threaded server
+    context = multiprocessing.get_context("spawn")
+    totals = [0, 0, 0.0]
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker) as pool:
+        futures = []
+        for i, (start, end) in enumerate(shards):
+            part_path = os.path.join(tmp_dir, f"part-{i:06d}.csv")
+            if is_columnar:
+                future = pool.submit(_score_columnar_shard, input_path, start, end, part_path, threshold)
+            else:
+                future = pool.submit(_score_csv_shard, input_path, start, end, names, part_path, threshold)
+            futures.append((future, part_path))
+
+        out = open(output, "wb") if isinstance(output, (str, os.PathLike)) else output
+        try:
+            out.write(header.to_csv(index=False).encode("utf-8"))
+            # Collect in submission order so the output keeps the input order
+            for done, (future, part_path) in enumerate(futures, 1):
+                rows, flagged, probability_sum = future.result()
+                totals[0] += rows
+                totals[1] += flagged
+                totals[2] += probability_sum
+                with open(part_path, "rb") as part:
+                    shutil.copyfileobj(part, out)
+                os.remove(part_path)
+                if on_progress is not None:
+                    on_progress(done / len(futures))
+        finally:
+            if out is not output:
+                out.close()
+
+    return tuple(totals)
@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_TTL_SECONDS = 60 * 60
+
+
+class PredictionCache:
+    """Bounded LRU cache with expiry for single-employee predictions.
+
+    Keys are the normalized feature vector; entries belong to one model
+    version and the whole cache is dropped as soon as a lookup arrives for
+    a different version. Safe to share between sessions.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._model_version = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(features):
+        return tuple(float(value) for value in features)
+
+    def _check_version(self, model_version):
+        if model_version != self._model_version:
+            self._entries.clear()
+            self._model_version = model_version
+
+    def get(self, model_version, features):
+        key = self.key(features)
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(model_version)
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, model_version, features, value):
+        key = self.key(features)
+        with self._lock:
+            self._check_version(model_version)
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, model_version, features, compute):
+        value = self.get(model_version, features)
+        if value is None:
+            value = compute()
+            self.put(model_version, features, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None
+        }
+
+
+prediction_cache = PredictionCache()
@@ -0,0 +1,344 @@
+"""Scored batch results kept server-side for paginated viewing.
+
+Each scored upload is written once as a columnar dataset (see columnar.py)
+under ``data/results/<key>``, together with precomputed row orders:
+
+- ``probability_order.npy``: all rows by descending Attrition Probability
+- ``department_order.npy``: rows grouped by Department, each group by
+  descending probability, with the group bounds in ``index.json``
+
+so a page of "top N overall" or "top N in Sales" is a slice of an index
+followed by a gather of just those rows. Nothing but the visible page is
+ever materialized as a frame. ``index.json`` also holds the result's drift
+summary (see drift.py).
+
+Results persist across restarts, so re-uploading an identical file is
+answered straight from disk. The store is bounded by
+``RESULT_STORE_MAX_BYTES``; the least recently viewed results go first.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+import columnar
+import drift
+from batch_scoring import CSV_FLOAT_FORMAT, INVALID_LABEL
+from instrumentation import span
+from scoring import DEFAULT_THRESHOLD, FEATURES, apply_threshold
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BASE_DIR, "data", "results")
+
+PROBABILITY_COLUMN = "Attrition Probability"
+FILTER_COLUMN = "Department"
+FLAGGED_LABEL = "Likely to Leave"
+STAY_LABEL = "Likely to Stay"
+
+INDEX_FILE = "index.json"
+PROBABILITY_ORDER_FILE = "probability_order.npy"
+DEPARTMENT_ORDER_FILE = "department_order.npy"
+
+SORT_ORDERS = ("probability_desc", "probability_asc", "file")
+
+CSV_EXPORT_CHUNK_SIZE = 100_000
+
+RESULT_STORE_MAX_BYTES = 2 * 1024 ** 3
+
+# Results being written live in directories with this prefix until complete
+STAGING_PREFIX = ".staging-"
+
+# Staging directories older than this are left by killed processes; no
+# job runs anywhere near this long
+STAGING_MAX_AGE_SECONDS = 24 * 3600
+
+
+def content_hash(source):
+    """sha256 of a file object's bytes; the read position is restored."""
+    digest = hashlib.sha256()
+    pos = source.tell()
+    source.seek(0)
+    for block in iter(lambda: source.read(1 << 20), b""):
+        digest.update(block)
+    source.seek(pos)
+    return digest.hexdigest()
+
+
+def result_key(upload_hash, model_version):
+    """Store key for one upload scored by one model.
+
+    The threshold isn't part of it: predictions are relabelled from the
+    stored probabilities whenever a result is viewed or downloaded.
+    """
+    model = hashlib.sha256(model_version.encode()).hexdigest()
+    return f"{upload_hash[:32]}-{model[:16]}"
+
+
+def _index_dtype(rows):
+    return np.int32 if rows < np.iinfo(np.int32).max else np.int64
+
+
+def _save_array(path, values):
+    # np.save appends .npy unless the name already ends with it
+    tmp_path = path[:-len(".npy")] + ".tmp.npy"
+    np.save(tmp_path, values)
+    os.replace(tmp_path, path)
+
+
+def build_indexes(dataset):
+    """Write the sort/filter indexes and summary for a scored dataset."""
+    rows = dataset.rows
+    dtype = _index_dtype(rows)
+    index = {"rows": rows, "invalid": 0, "probability_sum": 0.0, "departments": None, "drift": None}
+
+    if PROBABILITY_COLUMN in dataset.schema:
+        probability = np.asarray(dataset.array(PROBABILITY_COLUMN), dtype=np.float64)
+        # NaN probabilities sort last; stable so ties keep file order
+        order = np.argsort(-np.nan_to_num(probability, nan=-np.inf), kind="stable").astype(dtype)
+        _save_array(os.path.join(dataset.path, PROBABILITY_ORDER_FILE), order)
+        index["probability_sum"] = float(np.nansum(probability)) / 100
+
+        if all(col in dataset.schema for col in FEATURES):
+            with span("drift.summarize"):
+                index["drift"] = drift.summarize(dataset.read(FEATURES), probability / 100)
+
+        if FILTER_COLUMN in dataset.schema and dataset.schema[FILTER_COLUMN]["dtype"] == "category":
+            codes = np.asarray(dataset.array(FILTER_COLUMN), dtype=np.int64)
+            # Regroup the probability order by department; stable keeps it
+            # sorted by probability inside each group
+            grouped = order[np.argsort(codes[order], kind="stable")]
+            _save_array(os.path.join(dataset.path, DEPARTMENT_ORDER_FILE), grouped)
+            counts = np.bincount(codes + 1, minlength=len(dataset.schema[FILTER_COLUMN]["categories"]) + 1)
+            bounds = np.concatenate([[0], np.cumsum(counts)])
+            index["departments"] = {
+                name: [int(bounds[code + 1]), int(bounds[code + 2])]
+                for code, name in enumerate(dataset.schema[FILTER_COLUMN]["categories"])
+                if counts[code + 1]
+            }
+
+    if "Prediction" in dataset.schema:
+        code = dataset.category_code("Prediction", INVALID_LABEL)
+        if code is not None:
+            index["invalid"] = int(np.count_nonzero(np.asarray(dataset.array("Prediction")) == code))
+
+    # Written last: a result directory without it is incomplete
+    tmp_path = os.path.join(dataset.path, INDEX_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, os.path.join(dataset.path, INDEX_FILE))
+    return index
+
+
+def _percent(threshold):
+    # Stored probabilities are percentages rounded to 2 places
+    return round(threshold * 100, 2)
+
+
+def _relabel(frame, threshold):
+    """Recompute the Prediction column of a result frame for ``threshold``.
+
+    Labels follow the stored (rounded) probability, so they always agree
+    with the percentage shown next to them.
+    """
+    if "Prediction" not in frame.columns or PROBABILITY_COLUMN not in frame.columns:
+        return frame
+    flagged = apply_threshold(frame[PROBABILITY_COLUMN].to_numpy(dtype=np.float64), _percent(threshold))
+    frame["Prediction"] = np.where(
+        frame["Prediction"].to_numpy(dtype=object) == INVALID_LABEL,
+        INVALID_LABEL,
+        np.where(flagged == 1, FLAGGED_LABEL, STAY_LABEL)
+    )
+    return frame
+
+
+def _dir_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path))
+
+
+class ResultView:
+    """Paginated, sortable, filterable access to one stored result."""
+
+    def __init__(self, path):
+        self.dataset = columnar.ColumnarDataset(path)
+        with open(os.path.join(path, INDEX_FILE), encoding="utf-8") as f:
+            self.index = json.load(f)
+        self._orders = {}
+        self._flagged = {}
+
+    @property
+    def rows(self):
+        return self.index["rows"]
+
+    def flagged(self, threshold=DEFAULT_THRESHOLD):
+        """Rows flagged as likely to leave at ``threshold``."""
+        if threshold not in self._flagged:
+            if PROBABILITY_COLUMN in self.dataset.schema:
+                percent = np.asarray(self.dataset.array(PROBABILITY_COLUMN))
+                self._flagged[threshold] = int(apply_threshold(percent, _percent(threshold)).sum())
+            else:
+                self._flagged[threshold] = 0
+        return self._flagged[threshold]
+
+    @property
+    def invalid(self):
+        """Rows that failed schema validation and weren't scored."""
+        return self.index.get("invalid", 0)
+
+    @property
+    def scored(self):
+        return self.rows - self.invalid
+
+    @property
+    def drift(self):
+        """Histogram summary of the scored rows, or None for older results."""
+        return self.index.get("drift")
+
+    @property
+    def probability_sum(self):
+        return self.index["probability_sum"]
+
+    def departments(self):
+        """Department names present in the result (empty if not filterable)."""
+        return sorted(self.index["departments"] or {})
+
+    def _order(self, file_name):
+        if file_name not in self._orders:
+            self._orders[file_name] = np.load(os.path.join(self.dataset.path, file_name), mmap_mode="r")
+        return self._orders[file_name]
+
+    def _selection(self, department, sort):
+        if department is not None:
+            start, stop = (self.index["departments"] or {}).get(department, (0, 0))
+            selected = self._order(DEPARTMENT_ORDER_FILE)[start:stop]
+            if sort == "file":
+                selected = np.sort(selected)
+        elif sort == "file" or PROBABILITY_COLUMN not in self.dataset.schema:
+            selected = np.arange(self.rows)
+        else:
+            selected = self._order(PROBABILITY_ORDER_FILE)
+        if sort == "probability_asc":
+            selected = selected[::-1]
+        return selected
+
+    def count(self, department=None):
+        if department is None:
+            return self.rows
+        start, stop = (self.index["departments"] or {}).get(department, (0, 0))
+        return stop - start
+
+    def page(self, offset=0, limit=50, sort="probability_desc", department=None,
+             threshold=DEFAULT_THRESHOLD):
+        """Rows ``offset:offset+limit`` of the sorted, filtered result, labelled at ``threshold``."""
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort order {sort!r}; expected one of {SORT_ORDERS}")
+        with span("result_store.page"):
+            indices = np.asarray(self._selection(department, sort)[offset:offset + limit])
+            frame = _relabel(self.dataset.take(indices), threshold)
+            frame.index = indices
+        return frame
+
+    def select(self, columns, department=None):
+        """``columns`` of every row, or of one department's rows, in file order."""
+        indices = np.asarray(self._selection(department, "file"))
+        return self.dataset.take(indices, columns)
+
+    def iter_csv(self, threshold=DEFAULT_THRESHOLD, chunksize=CSV_EXPORT_CHUNK_SIZE):
+        """The full result labelled at ``threshold`` as UTF-8 CSV, one encoded chunk at a time."""
+        for i, chunk in enumerate(self.dataset.iter_chunks(chunksize=chunksize)):
+            chunk = _relabel(chunk, threshold)
+            with span("df.to_csv"):
+                data = chunk.to_csv(index=False, header=(i == 0), float_format=CSV_FLOAT_FORMAT).encode("utf-8")
+            yield data
+
+    def to_csv_bytes(self, threshold=DEFAULT_THRESHOLD):
+        return b"".join(self.iter_csv(threshold))
+
+
+class ResultStore:
+    """Directory of stored results keyed by upload hash, shared by all sessions."""
+
+    def __init__(self, root=RESULTS_DIR, max_bytes=RESULT_STORE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def path(self, key):
+        return os.path.join(self.root, key)
+
+    def get(self, key):
+        path = self.path(key)
+        index_path = os.path.join(path, INDEX_FILE)
+        if not os.path.isfile(index_path):
+            return None
+        try:
+            # The index mtime doubles as the last-used time for eviction
+            os.utime(index_path)
+        except OSError:
+            pass
+        return ResultView(path)
+
+    def save(self, key, frames):
+        """Store an iterable of scored frames under ``key`` and index it.
+
+        If the key is already stored, ``frames`` is not consumed. The result
+        is written to a private staging directory without holding the lock,
+        so several jobs can score at once, and moved into place when done;
+        if another job stored the same key meanwhile, that copy wins.
+        """
+        view = self.get(key)
+        if view is not None:
+            return view
+
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=self.root, prefix=STAGING_PREFIX)
+        try:
+            staged = os.path.join(staging, "result")
+            with span("result_store.save"):
+                build_indexes(columnar.write_frames(frames, staged))
+
+            with self._lock:
+                view = self.get(key)
+                if view is not None:
+                    return view
+                path = self.path(key)
+                if os.path.isdir(path):
+                    # Left over from an interrupted save
+                    shutil.rmtree(path)
+                os.replace(staged, path)
+                self._evict(keep=key)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return ResultView(path)
+
+    def _evict(self, keep):
+        entries = []
+        stale = time.time() - STAGING_MAX_AGE_SECONDS
+        for key in os.listdir(self.root):
+            if key.startswith(STAGING_PREFIX):
+                try:
+                    if os.path.getmtime(self.path(key)) < stale:
+                        shutil.rmtree(self.path(key), ignore_errors=True)
+                except OSError:
+                    pass
+                continue
+            index_path = os.path.join(self.path(key), INDEX_FILE)
+            if key == keep or not os.path.isfile(index_path):
+                continue
+            entries.append((os.path.getmtime(index_path), _dir_size(self.path(key)), key))
+
+        total = sum(size for _, size, _ in entries) + _dir_size(self.path(keep))
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            # An open view keeps its memory maps until it is dropped
+            shutil.rmtree(self.path(key), ignore_errors=True)
+            total -= size
+
+
+result_store = ResultStore()
@@ -0,0 +1,103 @@
+"""Declarative HR risk rules, evaluated as vectorized masks.
+
+Each rule compares one feature against a constant. To add a rule, append a
+row to ``RISK_RULES``; the Prediction page and batch output both pick it up.
+"""
+import operator
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import span
+from scoring import OVERTIME_CODES, encode_overtime
+
+
+Rule = namedtuple("Rule", ["name", "emoji", "feature", "op", "value", "suggestion"])
+
+RISK_RULES = [
+    Rule("Low Job Satisfaction", "😞", "JobSatisfaction", "<=", 2,
+         "Improve role clarity, recognition programs, and growth opportunities"),
+    Rule("Poor Work-Life Balance", "⚖️", "WorkLifeBalance", "<=", 2,
+         "Introduce flexible working hours or redistribute workload"),
+    Rule("Frequent Overtime", "⏰", "OverTime", "==", 1,
+         "Reduce overtime by reallocating tasks or adding resources"),
+    Rule("Below Market Salary", "💰", "MonthlyIncome", "<", 30000,
+         "Review salary structure and provide competitive compensation"),
+    Rule("Limited Work Experience", "📚", "TotalWorkingYears", "<", 3,
+         "Provide mentorship and structured training programs"),
+]
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    ">": operator.gt
+}
+
+RISK_COLUMN = "Risk Factors"
+ACTION_COLUMN = "HR Actions"
+SEPARATOR = "; "
+
+
+def evaluate(df, rules=RISK_RULES):
+    """Boolean matrix with one row per employee and one column per rule.
+
+    Missing columns and missing values never trigger a rule.
+    """
+    masks = np.zeros((len(df), len(rules)), dtype=bool)
+    for i, rule in enumerate(rules):
+        if rule.feature not in df.columns:
+            continue
+        values = df[rule.feature]
+        if rule.feature == "OverTime":
+            values = encode_overtime(values)
+        values = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+        masks[:, i] = OPERATORS[rule.op](values, rule.value)
+    return masks
+
+
+def _labels(masks, texts):
+    # Rows share few distinct rule combinations, so join strings once per
+    # combination and broadcast them back with the inverse index
+    weights = np.left_shift(1, np.arange(masks.shape[1], dtype=np.int64))
+    codes = masks.astype(np.int64) @ weights
+    unique, inverse = np.unique(codes, return_inverse=True)
+    joined = np.array(
+        [SEPARATOR.join(t for bit, t in enumerate(texts) if code >> bit & 1) for code in unique],
+        dtype=object
+    )
+    return joined[inverse]
+
+
+def annotate(df, rules=RISK_RULES):
+    """Add the Risk Factors and HR Actions columns to ``df`` in place."""
+    with span("risk_rules"):
+        masks = evaluate(df, rules)
+        df[RISK_COLUMN] = _labels(masks, [rule.name for rule in rules])
+        df[ACTION_COLUMN] = _labels(masks, [rule.suggestion for rule in rules])
+    return df
+
+
+def _matches(rule, record):
+    value = record.get(rule.feature)
+    if rule.feature == "OverTime" and isinstance(value, str):
+        value = OVERTIME_CODES.get(value)
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return False
+    # NaN compares False, same as in evaluate()
+    return bool(OPERATORS[rule.op](value, rule.value))
+
+
+def for_record(record, rules=RISK_RULES):
+    """Risks ``[(name, emoji)]`` and suggestions for one employee's features.
+
+    Scalar twin of ``evaluate`` for the single-prediction page, where
+    building a one-row frame would cost more than the rules themselves.
+    """
+    hits = [rule for rule in rules if _matches(rule, record)]
+    return [(rule.name, rule.emoji) for rule in hits], [rule.suggestion for rule in hits]
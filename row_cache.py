@@ -0,0 +1,183 @@
+"""Per-employee probability cache for incremental batch scoring.
+
+Keyed by ``EmployeeNumber`` and checked against a hash of the employee's
+eight model features, so a re-uploaded export only sends new or changed
+employees through the model. Probabilities don't depend on the decision
+threshold, so moving the threshold slider re-scores nothing either.
+
+There is one cache per model version, persisted under ``data/row_cache/``
+as a single structured ``.npy`` file sorted by employee number. Lookups
+are a vectorized ``searchsorted``; misses are merged in when an upload
+finishes. The least recently seen employees are dropped once a cache
+exceeds ``ROW_CACHE_MAX_ROWS``, and only the newest model versions keep a
+cache on disk.
+"""
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import span
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROW_CACHE_DIR = os.path.join(BASE_DIR, "data", "row_cache")
+
+ID_COLUMN = "EmployeeNumber"
+
+ROW_CACHE_MAX_ROWS = 2_000_000
+ROW_CACHE_VERSIONS = 2
+
+ENTRY_DTYPE = np.dtype([
+    ("employee", np.int64),
+    ("row_hash", np.uint64),
+    ("probability", np.float64),
+    ("seen", np.int64)
+])
+
+
+def row_hashes(features):
+    """64-bit hash of each row of a prepared feature matrix."""
+    return pd.util.hash_pandas_object(pd.DataFrame(features), index=False).to_numpy()
+
+
+def _employee_ids(df):
+    # Blank or non-numeric IDs can't be matched and are always scored
+    ids = pd.to_numeric(df[ID_COLUMN], errors="coerce").to_numpy(dtype=np.float64)
+    valid = np.isfinite(ids) & (ids == np.round(ids))
+    return np.where(valid, ids, 0).astype(np.int64), valid
+
+
+def _latest(entries):
+    # Stable sort keeps later entries after earlier ones with the same ID
+    order = np.argsort(entries["employee"], kind="stable")
+    ordered = entries["employee"][order]
+    last = np.append(ordered[1:] != ordered[:-1], True)
+    return entries[order[last]]
+
+
+class RowCache:
+    """Cached probabilities for one model version."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = []
+        # (employee IDs, time) of cache hits, whose "seen" is refreshed on flush
+        self._touched = []
+        self.hits = 0
+        self.misses = 0
+        try:
+            self._entries = np.load(path)
+        except (FileNotFoundError, ValueError):
+            self._entries = np.empty(0, dtype=ENTRY_DTYPE)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, employees, hashes):
+        """Cached probabilities (NaN where missing or stale) and a hit mask."""
+        entries = self._entries
+        probability = np.full(len(employees), np.nan)
+        if not len(entries):
+            return probability, np.zeros(len(employees), dtype=bool)
+        positions = np.searchsorted(entries["employee"], employees)
+        positions = np.minimum(positions, len(entries) - 1)
+        found = entries[positions]
+        hit = (found["employee"] == employees) & (found["row_hash"] == hashes)
+        probability[hit] = found["probability"][hit]
+        return probability, hit
+
+    def score(self, df, pipeline, features=None):
+        """Attrition probabilities for ``df``, running the model on misses only.
+
+        ``features`` is ``pipeline.prepare(df)``, if the caller has it already.
+        """
+        if features is None:
+            features = pipeline.prepare(df)
+        if ID_COLUMN not in df.columns:
+            return pipeline.predict_proba(features)
+
+        with span("row_cache.lookup"):
+            employees, valid = _employee_ids(df)
+            hashes = row_hashes(features)
+            probability, hit = self.lookup(employees, hashes)
+            hit &= valid
+            if hit.any():
+                with self._lock:
+                    self._touched.append((employees[hit], time.time_ns()))
+
+        miss = ~hit
+        if miss.any():
+            probability[miss] = pipeline.predict_proba(features[miss])
+            fresh = valid & miss
+            pending = np.empty(int(fresh.sum()), dtype=ENTRY_DTYPE)
+            pending["employee"] = employees[fresh]
+            pending["row_hash"] = hashes[fresh]
+            pending["probability"] = probability[fresh]
+            pending["seen"] = time.time_ns()
+            with self._lock:
+                self._pending.append(pending)
+
+        self.hits += int(hit.sum())
+        self.misses += int(miss.sum())
+        return probability
+
+    def flush(self):
+        """Merge pending entries in and persist; call once an upload is scored."""
+        with self._lock:
+            if not self._pending and not self._touched:
+                return
+            with span("row_cache.flush"):
+                entries = self._entries.copy()
+                for employees, seen in self._touched:
+                    positions = np.minimum(np.searchsorted(entries["employee"], employees), len(entries) - 1)
+                    positions = positions[entries["employee"][positions] == employees]
+                    entries["seen"][positions] = seen
+                entries = _latest(np.concatenate([entries] + self._pending))
+                if len(entries) > ROW_CACHE_MAX_ROWS:
+                    recent = np.argsort(entries["seen"], kind="stable")[-ROW_CACHE_MAX_ROWS:]
+                    entries = entries[np.sort(recent)]
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = self.path[:-len(".npy")] + ".tmp.npy"
+                np.save(tmp_path, entries)
+                os.replace(tmp_path, self.path)
+                self._entries = entries
+                self._pending = []
+                self._touched = []
+
+
+class RowCacheStore:
+    """One ``RowCache`` per model version, shared by every session."""
+
+    def __init__(self, root=ROW_CACHE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._caches = {}
+
+    def for_model(self, model_version):
+        name = hashlib.sha256(model_version.encode()).hexdigest()[:16] + ".npy"
+        with self._lock:
+            cache = self._caches.get(name)
+            if cache is None:
+                cache = self._caches[name] = RowCache(os.path.join(self.root, name))
+                self._evict_versions(keep=name)
+            return cache
+
+    def _evict_versions(self, keep):
+        # Probabilities from a replaced model are never valid again
+        try:
+            names = [n for n in os.listdir(self.root)
+                     if n.endswith(".npy") and not n.endswith(".tmp.npy") and n != keep]
+        except FileNotFoundError:
+            return
+        names.sort(key=lambda n: os.path.getmtime(os.path.join(self.root, n)), reverse=True)
+        for name in names[ROW_CACHE_VERSIONS - 1:]:
+            os.remove(os.path.join(self.root, name))
+            self._caches.pop(name, None)
+
+
+row_caches = RowCacheStore()
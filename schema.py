@@ -0,0 +1,95 @@
+"""Declared types and valid ranges of the model's input features.
+
+The bounds are the ones the Prediction page enforces on its inputs, so a
+batch row is scored only if it could have been entered by hand. Uploads
+are parsed with pandas' own type inference (plus OverTime as a category)
+and then validated column by column with vectorized masks; rows that fail
+are reported in ``ERROR_COLUMN`` instead of aborting the batch, and are
+never sent through the model.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from scoring import FEATURES, SchemaError, encode_overtime
+
+
+Field = namedtuple("Field", ["name", "dtype", "min", "max"])
+
+FIELDS = {
+    field.name: field for field in [
+        Field("Age", np.int8, 18, 60),
+        Field("MonthlyIncome", np.int32, 1000, 200000),
+        Field("TotalWorkingYears", np.int8, 0, 40),
+        Field("YearsAtCompany", np.int8, 0, 40),
+        Field("JobSatisfaction", np.int8, 1, 4),
+        Field("WorkLifeBalance", np.int8, 1, 4),
+        Field("EnvironmentSatisfaction", np.int8, 1, 4),
+        # Yes/No (or 1/0); stored as a category, validated via its 0/1 code
+        Field("OverTime", "category", 0, 1)
+    ]
+}
+
+# Parse OverTime straight into a category; numeric columns are inferred by
+# pandas and narrowed after validation
+CSV_DTYPES = {"OverTime": "category"}
+
+ERROR_COLUMN = "Validation Errors"
+SEPARATOR = "; "
+
+
+def _problem(field):
+    if field.name == "OverTime":
+        return "OverTime must be Yes/No or 1/0"
+    return f"{field.name} must be a whole number {field.min}-{field.max}"
+
+
+def _check(values, field):
+    """Valid mask for one column, and the column in its compact dtype."""
+    if field.name == "OverTime":
+        codes = pd.to_numeric(encode_overtime(values), errors="coerce").to_numpy(dtype=np.float64)
+        return np.isin(codes, (0, 1)), values
+
+    if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+        values = pd.to_numeric(values, errors="coerce")
+    numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    # NaN fails every comparison, so blanks and unparsable text are invalid
+    valid = (numbers >= field.min) & (numbers <= field.max) & (numbers == np.floor(numbers))
+
+    if valid.all():
+        return valid, pd.Series(numbers.astype(field.dtype), index=values.index, name=values.name)
+    # Invalid values can't be kept in an integer column; they become NaN
+    # (float32 is exact for every valid value) and the error column says why
+    compact = np.where(valid, numbers, np.nan).astype(np.float32)
+    return valid, pd.Series(compact, index=values.index, name=values.name)
+
+
+def validate(df):
+    """Coerce ``df``'s feature columns to compact dtypes in place and check them.
+
+    Returns the valid-row mask and each row's error message (empty for good
+    rows), for the caller to store in ``ERROR_COLUMN``. A missing feature
+    column is a problem with the file rather than with any row, so it
+    raises ``SchemaError``.
+    """
+    missing = [col for col in FEATURES if col not in df.columns]
+    if missing:
+        raise SchemaError(f"Missing required columns: {', '.join(missing)}")
+
+    fields = list(FIELDS.values())
+    problems = np.zeros((len(df), len(fields)), dtype=bool)
+    for i, field in enumerate(fields):
+        valid, values = _check(df[field.name], field)
+        df[field.name] = values
+        problems[:, i] = ~valid
+
+    # Few rows have problems, so only those get a joined message
+    bad = problems.any(axis=1)
+    errors = np.full(len(df), "", dtype=object)
+    if bad.any():
+        messages = [_problem(field) for field in fields]
+        errors[bad] = [
+            SEPARATOR.join(m for m, failed in zip(messages, row) if failed) for row in problems[bad]
+        ]
+    return ~bad, errors
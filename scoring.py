@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+
+from instrumentation import span
+
+
+DEFAULT_THRESHOLD = 0.5
+
+# Column order the scaler and model were fitted on
+FEATURES = [
+    "Age",
+    "MonthlyIncome",
+    "TotalWorkingYears",
+    "YearsAtCompany",
+    "JobSatisfaction",
+    "WorkLifeBalance",
+    "EnvironmentSatisfaction",
+    "OverTime"
+]
+
+OVERTIME_CODES = {"Yes": 1, "No": 0}
+
+# Also accepted in uploads: a 0/1 column read as text (OverTime is parsed
+# as a category) or mixed into a Yes/No column
+_OVERTIME_INPUTS = {**OVERTIME_CODES, "1": 1, "0": 0, 1: 1, 0: 0}
+
+# Batch output gets this many "Top Factor" columns
+TOP_FACTORS = 3
+FACTOR_COLUMNS = [f"Top Factor {i}" for i in range(1, TOP_FACTORS + 1)]
+
+
+class SchemaError(ValueError):
+    """Raised when the model artifacts don't agree on the feature schema."""
+
+
+def apply_threshold(probability, threshold=DEFAULT_THRESHOLD):
+    """Turn attrition probabilities into 0/1 labels."""
+    return (np.asarray(probability) >= threshold).astype(np.int8)
+
+
+def top_factors(contributions, n=TOP_FACTORS):
+    """Names of each row's ``n`` largest positive contributions, strongest first.
+
+    Rows with fewer than ``n`` features pushing towards attrition get empty
+    strings in the remaining places.
+    """
+    contributions = np.asarray(contributions, dtype=np.float64)
+    order = np.argsort(-contributions, axis=1, kind="stable")[:, :n]
+    names = np.asarray(FEATURES, dtype=object)[order]
+    names[np.take_along_axis(contributions, order, axis=1) <= 0] = ""
+    return [names[:, i] for i in range(n)]
+
+
+def _tree_estimators(model):
+    from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+    from sklearn.tree import DecisionTreeClassifier
+
+    if isinstance(model, DecisionTreeClassifier):
+        return [model]
+    if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+        return model.estimators_
+    return None
+
+
+def _leaf_tables(model, n_features):
+    """Per tree, a (nodes x features) array of contributions from root to node.
+
+    Moving from a node to its child changes the predicted probability; the
+    change is credited to the feature the node splits on. Accumulated down
+    the tree, row ``i`` of a tree's table is the decomposition of node
+    ``i``'s probability, so a sample's contributions are the row of the
+    leaf it lands in.
+    """
+    estimators = _tree_estimators(model)
+    if estimators is None:
+        raise TypeError(f"Feature contributions aren't supported for {type(model).__name__}")
+
+    tables = []
+    for estimator in estimators:
+        tree = estimator.tree_
+        value = tree.value[:, 0, :]
+        probability = value[:, 1] / value.sum(axis=1)
+        table = np.zeros((tree.node_count, n_features))
+        # One tree level at a time
+        nodes = np.array([0])
+        while len(nodes):
+            nodes = nodes[tree.children_left[nodes] >= 0]
+            for children in (tree.children_left[nodes], tree.children_right[nodes]):
+                table[children] = table[nodes]
+                table[children, tree.feature[nodes]] += probability[children] - probability[nodes]
+            nodes = np.concatenate([tree.children_left[nodes], tree.children_right[nodes]])
+        tables.append(table)
+    return tables
+
+
+def encode_overtime(values):
+    """Map OverTime Yes/No (or 1/0 as text) to 1/0, leaving numeric values alone.
+
+    Anything else becomes NaN.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Maps the categories rather than every row
+        return values.map(_OVERTIME_INPUTS).astype(np.float64)
+    return values.astype(object).map(_OVERTIME_INPUTS)
+
+
+class ScoringPipeline:
+    """Feature selection, OverTime encoding, scaling and the estimator in one.
+
+    The schema is checked when the pipeline is built, so a scaler and model
+    fitted on different columns fail at load time instead of producing
+    silently wrong scores. For binary linear models the scaler is folded
+    into the coefficients and scoring is a single matrix-vector product on
+    the raw feature matrix.
+    """
+
+    def __init__(self, model, scaler, input_columns=None):
+        self.model = model
+        self.scaler = scaler
+        self.features = list(getattr(scaler, "feature_names_in_", FEATURES))
+
+        if self.features != FEATURES:
+            raise SchemaError(f"Scaler was fitted on {self.features}, expected {FEATURES}")
+        if getattr(model, "n_features_in_", len(FEATURES)) != len(FEATURES):
+            raise SchemaError(
+                f"Model expects {model.n_features_in_} features, scaler provides {len(FEATURES)}"
+            )
+        if input_columns is not None:
+            missing = [col for col in FEATURES if col not in input_columns]
+            if missing:
+                raise SchemaError(f"Model features missing from the input schema: {missing}")
+        if list(getattr(model, "classes_", [0, 1])) != [0, 1]:
+            raise SchemaError(f"Expected binary 0/1 classes, got {list(model.classes_)}")
+
+        self.weights = None
+        self.bias = None
+        self.mean = None
+        self._leaf_tables = None
+        coef = getattr(model, "coef_", None)
+        if coef is not None and coef.shape[0] == 1 and hasattr(model, "intercept_"):
+            mean = scaler.mean_ if getattr(scaler, "mean_", None) is not None else 0.0
+            scale = scaler.scale_ if getattr(scaler, "scale_", None) is not None else 1.0
+            # w . ((x - mean) / scale) + b == (w / scale) . x + (b - w . mean / scale)
+            self.weights = np.ascontiguousarray(coef[0] / scale)
+            self.mean = np.broadcast_to(np.asarray(mean, dtype=np.float64), self.weights.shape)
+            self.bias = float(model.intercept_[0] - np.sum(coef[0] * mean / scale))
+
+    @property
+    def is_linear(self):
+        return self.weights is not None
+
+    def prepare(self, df):
+        """Select, encode and fill the model features of ``df`` as a float64 matrix."""
+        input_data = df.reindex(columns=FEATURES)
+        input_data["OverTime"] = encode_overtime(input_data["OverTime"])
+        return input_data.fillna(0).to_numpy(dtype=np.float64)
+
+    def predict_proba(self, features):
+        """Attrition probability for a raw (unscaled) feature matrix."""
+        features = np.asarray(features, dtype=np.float64)
+        if self.is_linear:
+            with span("predict_proba"):
+                # exp overflows to inf for very negative logits, giving 0
+                with np.errstate(over="ignore"):
+                    return 1 / (1 + np.exp(-(features @ self.weights + self.bias)))
+        with span("scaler.transform"):
+            scaled = self.scaler.transform(features)
+        with span("predict_proba"):
+            return self.model.predict_proba(scaled)[:, 1]
+
+    @property
+    def is_explainable(self):
+        return self.is_linear or _tree_estimators(self.model) is not None
+
+    def contributions(self, features):
+        """Per-row, per-feature contributions to the attrition score.
+
+        For linear models this is coefficient times scaled value, in
+        log-odds relative to the average employee. For decision trees and
+        random forests it is the tree-path decomposition: the change in
+        predicted probability at every split along each row's path,
+        credited to the split's feature and averaged over the trees; the
+        per-leaf sums are precomputed, so a batch costs one ``apply``.
+        """
+        features = np.asarray(features, dtype=np.float64)
+        with span("contributions"):
+            if self.is_linear:
+                return (features - self.mean) * self.weights
+            if self._leaf_tables is None:
+                self._leaf_tables = _leaf_tables(self.model, len(FEATURES))
+            leaves = self.model.apply(self.scaler.transform(features)).reshape(len(features), -1)
+            total = np.zeros((len(features), len(FEATURES)))
+            for table, leaf in zip(self._leaf_tables, leaves.T):
+                total += table[leaf]
+            return total / len(self._leaf_tables)
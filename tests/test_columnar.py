@@ -0,0 +1,37 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+import columnar
+
+
+def test_text_after_a_blank_chunk_becomes_category(tmp_path):
+    # The note column is empty for the whole first chunk, so that chunk
+    # parses as float; the text in the second chunk must not fail the write
+    rows = 250
+    notes = [""] * 200 + [f"note {i}" for i in range(50)]
+    source = pd.DataFrame({"Age": np.arange(rows) % 40 + 18, "Note": notes})
+    csv = io.StringIO(source.to_csv(index=False))
+
+    dataset = columnar.ingest_csv(csv, tmp_path / "out", chunksize=100)
+
+    assert dataset.schema["Note"]["dtype"] == "category"
+    frame = dataset.read()
+    assert frame["Note"].iloc[:200].isna().all()
+    assert frame["Note"].iloc[200:].tolist() == notes[200:]
+    assert frame["Age"].tolist() == source["Age"].tolist()
+
+
+def test_numbers_before_text_keep_their_values(tmp_path):
+    frames = [
+        pd.DataFrame({"Code": [1.5, np.nan]}),
+        pd.DataFrame({"Code": ["A7", None]}),
+        pd.DataFrame({"Code": [3, 4]})
+    ]
+
+    dataset = columnar.write_frames(frames, tmp_path / "out")
+
+    values = dataset.read()["Code"]
+    assert values.isna().tolist() == [False, True, False, True, False, False]
+    assert values.dropna().tolist() == [1.5, "A7", 3, 4]
@@ -0,0 +1,347 @@
+"""Rebuild the model artifacts from HR-Employee-Attrition.csv.
+
+    python -m train                       # search, then update models/ if no worse
+    python -m train --no-search           # the notebook's exact configuration
+    python -m train --fast-variant --output-dir /tmp/candidate
+
+Replaces the manual steps in Employee_Attrition.ipynb: the same eight
+features, the same stratified 80/20 split (random_state 42) and a
+StandardScaler fitted on the training rows. Every random seed is fixed, so
+the same CSV and library versions always produce the same models.
+
+With search enabled (the default) candidate estimators are compared by
+cross-validated ROC AUC in parallel (``--jobs``). The winner is refitted
+on the training split and evaluated on the held-out split. Its version and
+metrics are written to ``model_card.json`` next to the artifacts.
+``--fast-variant`` also writes a cheaper model to ``<output-dir>/fast/``
+and prints its accuracy and latency against the current model.
+
+The live artifacts in ``models/`` are only replaced if the new model's
+held-out accuracy and ROC AUC are at least the current model's; otherwise
+nothing is written and the run exits with status 1. ``--force`` replaces
+them anyway, and ``--output-dir`` writes a candidate elsewhere without the
+check.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from model_registry import FEATURES_PATH, MODEL_CARD_PATH, MODEL_PATH, SCALER_PATH
+from scoring import FEATURES, ScoringPipeline, encode_overtime
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.path.join(BASE_DIR, "HR-Employee-Attrition.csv")
+MODELS_DIR = os.path.dirname(MODEL_PATH)
+
+MODEL_CARD_FILE = os.path.basename(MODEL_CARD_PATH)
+FAST_VARIANT_DIR = "fast"
+
+TARGET = "Attrition"
+RANDOM_STATE = 42
+TEST_SIZE = 0.2
+CV_FOLDS = 5
+
+# Candidates for the cross-validated search, as (estimator, grid)
+SEARCH_SPACE = [
+    (LogisticRegression(max_iter=1000), {
+        "C": [0.01, 0.1, 1.0, 10.0],
+        "class_weight": [None, "balanced"]
+    }),
+    (RandomForestClassifier(random_state=RANDOM_STATE), {
+        "n_estimators": [200],
+        "max_depth": [4, 8, None],
+        "min_samples_leaf": [1, 5],
+        "class_weight": [None, "balanced"]
+    })
+]
+
+# A fast variant may lose at most this much held-out ROC AUC
+FAST_MAX_AUC_LOSS = 0.01
+
+
+def load_training_data(path=DATASET_PATH):
+    """Features (``FEATURES`` order, OverTime as 0/1), labels and the raw columns."""
+    df = pd.read_csv(path)
+    X = df[FEATURES].copy()
+    X["OverTime"] = encode_overtime(X["OverTime"])
+    y = (df[TARGET] == "Yes").astype(int)
+    input_columns = [col for col in df.columns if col != TARGET]
+    return X, y, input_columns
+
+
+def split(X, y):
+    return train_test_split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=y)
+
+
+def _unprefixed(params):
+    return {key.split("__", 1)[1]: value for key, value in params.items()}
+
+
+def search(X_train, y_train, jobs):
+    """Best estimator (unfitted), its CV result and those of every candidate.
+
+    The scaler is part of each CV pipeline so it's refitted per fold.
+    """
+    folds = StratifiedKFold(CV_FOLDS, shuffle=True, random_state=RANDOM_STATE)
+    results = []
+    best = None
+    for estimator, grid in SEARCH_SPACE:
+        grid_search = GridSearchCV(
+            Pipeline([("scaler", StandardScaler()), ("model", estimator)]),
+            {f"model__{key}": values for key, values in grid.items()},
+            scoring="roc_auc", cv=folds, n_jobs=jobs
+        )
+        grid_search.fit(X_train, y_train)
+        name = type(estimator).__name__
+        for params, score in zip(grid_search.cv_results_["params"],
+                                 grid_search.cv_results_["mean_test_score"]):
+            results.append({"estimator": name, "params": _unprefixed(params),
+                            "cv_roc_auc": round(float(score), 4)})
+        if best is None or grid_search.best_score_ > best[1]["cv_roc_auc"]:
+            params = _unprefixed(grid_search.best_params_)
+            best = (clone(estimator).set_params(**params), {
+                "estimator": name, "params": params, "cv_roc_auc": round(float(grid_search.best_score_), 4)
+            })
+    return best[0], best[1], results
+
+
+def evaluate(model, X, y):
+    probability = model.predict_proba(X)[:, 1]
+    predicted = (probability >= 0.5).astype(int)
+    return {
+        "accuracy": round(float(accuracy_score(y, predicted)), 4),
+        "precision": round(float(precision_score(y, predicted, zero_division=0)), 4),
+        "recall": round(float(recall_score(y, predicted)), 4),
+        "f1": round(float(f1_score(y, predicted)), 4),
+        "roc_auc": round(float(roc_auc_score(y, probability)), 4)
+    }
+
+
+def fit(model, X_train, y_train):
+    # The scaler is fitted on the DataFrame so it records feature names,
+    # which ScoringPipeline checks against FEATURES
+    scaler = StandardScaler().fit(X_train)
+    model.fit(scaler.transform(X_train), y_train)
+    return model, scaler
+
+
+def artifact_bytes(obj):
+    buffer = io.BytesIO()
+    joblib.dump(obj, buffer)
+    return buffer.getvalue()
+
+
+def model_version(model, scaler):
+    """Content hash of the fitted model and scaler."""
+    digest = hashlib.sha256(artifact_bytes(model))
+    digest.update(artifact_bytes(scaler))
+    return digest.hexdigest()[:12]
+
+
+def measure_latency(model, scaler, X, repeats=200, batch_rows=10_000):
+    """Median single-row and per-row batch latency through ScoringPipeline."""
+    pipeline = ScoringPipeline(model, scaler)
+    features = X.to_numpy(dtype=np.float64)
+    row = features[:1]
+    batch = np.resize(features, (batch_rows, features.shape[1]))
+
+    def median_seconds(fn, n):
+        samples = []
+        for _ in range(n):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples)
+
+    pipeline.predict_proba(row)
+    return {
+        "single_row_us": round(median_seconds(lambda: pipeline.predict_proba(row), repeats) * 1e6, 1),
+        "batch_row_us": round(median_seconds(lambda: pipeline.predict_proba(batch), 10) / batch_rows * 1e6, 3)
+    }
+
+
+def fast_variant(best_model, X_train, y_train, X_test, y_test, reference_auc):
+    """Cheapest model within ``FAST_MAX_AUC_LOSS`` of the reference AUC.
+
+    Forests are shrunk (fewer, shallower trees); linear models are sparsified
+    with an L1 penalty so fewer features carry weight.
+    """
+    if isinstance(best_model, RandomForestClassifier):
+        params = best_model.get_params()
+        candidates = [
+            RandomForestClassifier(**{**params, "n_estimators": n, "max_depth": depth})
+            for n in (10, 25, 50)
+            for depth in (3, 4, 6)
+        ]
+    else:
+        candidates = [
+            LogisticRegression(l1_ratio=1.0, solver="liblinear", C=c,
+                               class_weight=best_model.get_params().get("class_weight"),
+                               random_state=RANDOM_STATE)
+            for c in (0.015, 0.02, 0.03, 0.05, 0.1)
+        ]
+
+    # Candidates run from cheapest to most expensive, so the first one
+    # within tolerance wins
+    fallback = None
+    for model in candidates:
+        model, scaler = fit(model, X_train, y_train)
+        metrics = evaluate(model, scaler.transform(X_test), y_test)
+        if fallback is None or metrics["roc_auc"] > fallback[2]["roc_auc"]:
+            fallback = (model, scaler, metrics)
+        if metrics["roc_auc"] >= reference_auc - FAST_MAX_AUC_LOSS:
+            return model, scaler, metrics
+    return fallback
+
+
+def describe(model):
+    if isinstance(model, RandomForestClassifier):
+        depth = max(tree.get_depth() for tree in model.estimators_)
+        return f"RandomForest({len(model.estimators_)} trees, depth <= {depth})"
+    nonzero = int(np.count_nonzero(model.coef_))
+    return f"LogisticRegression({nonzero}/{model.coef_.size} non-zero weights)"
+
+
+def _dump(obj, path):
+    tmp_path = path + ".tmp"
+    joblib.dump(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_artifacts(output_dir, model, scaler, input_columns, card):
+    os.makedirs(output_dir, exist_ok=True)
+    # Model last: the registry rebuilds its pipeline when the model changes
+    _dump(input_columns, os.path.join(output_dir, os.path.basename(FEATURES_PATH)))
+    _dump(scaler, os.path.join(output_dir, os.path.basename(SCALER_PATH)))
+    _dump(model, os.path.join(output_dir, os.path.basename(MODEL_PATH)))
+    with open(os.path.join(output_dir, MODEL_CARD_FILE), "w", encoding="utf-8") as f:
+        json.dump(card, f, indent=2)
+
+
+def _dataset_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _current_model():
+    try:
+        return joblib.load(MODEL_PATH), joblib.load(SCALER_PATH)
+    except FileNotFoundError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the attrition model artifacts")
+    parser.add_argument("--data", default=DATASET_PATH, help="Training CSV (default: %(default)s)")
+    parser.add_argument("--output-dir", default=MODELS_DIR,
+                        help="Where to write the artifacts (default: %(default)s)")
+    parser.add_argument("--no-search", action="store_true",
+                        help="Skip the search and fit the notebook's LogisticRegression(max_iter=1000)")
+    parser.add_argument("--jobs", type=int, default=-1,
+                        help="Parallel search processes; -1 uses every core (default: %(default)s)")
+    parser.add_argument("--fast-variant", action="store_true",
+                        help=f"Also write a latency-optimized model to <output-dir>/{FAST_VARIANT_DIR}/")
+    parser.add_argument("--force", action="store_true",
+                        help="Replace the live models even if their held-out metrics are better")
+    args = parser.parse_args(argv)
+
+    # Read the current model before a run into models/ replaces it
+    current = _current_model()
+
+    X, y, input_columns = load_training_data(args.data)
+    X_train, X_test, y_train, y_test = split(X, y)
+
+    if args.no_search:
+        model, best, results = LogisticRegression(max_iter=1000), None, []
+    else:
+        start = time.perf_counter()
+        model, best, results = search(X_train, y_train, args.jobs)
+        print(f"Searched {len(results)} candidates in {time.perf_counter() - start:.1f}s; best "
+              f"{best['estimator']} {best['params']} (CV ROC AUC {best['cv_roc_auc']})", file=sys.stderr)
+
+    model, scaler = fit(model, X_train, y_train)
+    test_metrics = evaluate(model, scaler.transform(X_test), y_test)
+    card = {
+        "version": model_version(model, scaler),
+        "estimator": describe(model),
+        "params": {k: v for k, v in model.get_params().items() if isinstance(v, (int, float, str, type(None)))},
+        "features": FEATURES,
+        "dataset_sha256": _dataset_hash(args.data),
+        "split": {"test_size": TEST_SIZE, "random_state": RANDOM_STATE, "stratify": TARGET},
+        "sklearn_version": sklearn.__version__,
+        "test_metrics": test_metrics,
+        "full_data_accuracy": evaluate(model, scaler.transform(X), y)["accuracy"],
+        "search": {"cv_folds": CV_FOLDS, "scoring": "roc_auc", "best": best,
+                   "candidates": results} if best else None
+    }
+
+    report = [("trained", model, scaler, test_metrics)]
+    current_metrics = None
+    if current is not None:
+        current_metrics = evaluate(current[0], current[1].transform(X_test), y_test)
+        report.insert(0, ("current", *current, current_metrics))
+
+    replaces_live = os.path.abspath(args.output_dir) == os.path.abspath(MODELS_DIR)
+    worse = current_metrics is not None and any(
+        test_metrics[metric] < current_metrics[metric] for metric in ("accuracy", "roc_auc")
+    )
+    refused = replaces_live and worse and not args.force
+
+    if args.fast_variant and not refused:
+        fast_model, fast_scaler, fast_metrics = fast_variant(
+            model, X_train, y_train, X_test, y_test, test_metrics["roc_auc"]
+        )
+        fast_card = {
+            **card,
+            "version": model_version(fast_model, fast_scaler),
+            "estimator": describe(fast_model),
+            "params": {k: v for k, v in fast_model.get_params().items()
+                       if isinstance(v, (int, float, str, type(None)))},
+            "test_metrics": fast_metrics,
+            "full_data_accuracy": evaluate(fast_model, fast_scaler.transform(X), y)["accuracy"],
+            "variant_of": card["version"],
+            "search": None
+        }
+        write_artifacts(os.path.join(args.output_dir, FAST_VARIANT_DIR),
+                        fast_model, fast_scaler, input_columns, fast_card)
+        report.append(("fast", fast_model, fast_scaler, fast_metrics))
+
+    if not refused:
+        write_artifacts(args.output_dir, model, scaler, input_columns, card)
+
+    print(f"{'model':<8} {'estimator':<48} {'accuracy':>8} {'roc_auc':>8} {'1 row us':>9} {'per row us':>10}")
+    for name, m, s, metrics in report:
+        latency = measure_latency(m, s, X_test)
+        print(f"{name:<8} {describe(m):<48} {metrics['accuracy']:>8} {metrics['roc_auc']:>8} "
+              f"{latency['single_row_us']:>9} {latency['batch_row_us']:>10}")
+    if refused:
+        print(f"Not replacing {args.output_dir}: the trained model's held-out metrics are worse than the "
+              f"current model's. Use --output-dir to keep it as a candidate, or --force.", file=sys.stderr)
+        return 1
+    print(f"Wrote version {card['version']} to {args.output_dir}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
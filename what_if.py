@@ -0,0 +1,99 @@
+"""What-if sensitivity sweeps over an employee's model features.
+
+For every feature, each employee is re-scored with that one feature set to
+every value of its sweep while the others stay as they are. All
+perturbations of a batch of employees form one matrix and go through a
+single ``predict_proba`` call, so a single employee's ~100-point sweep is
+one call, and a whole department is a handful of calls of
+``SWEEP_CHUNK_ROWS`` employees each.
+"""
+import numpy as np
+import pandas as pd
+
+from instrumentation import span
+from schema import FIELDS
+from scoring import FEATURES
+
+
+# Values each feature is swept over, across the schema bounds. Monthly
+# income steps by 1,000 up to 20,000, above every salary in the HR data,
+# then log-spaced up to the schema maximum
+SWEEPS = {
+    "Age": np.arange(FIELDS["Age"].min, FIELDS["Age"].max + 1, 3),
+    "MonthlyIncome": np.unique(np.concatenate([
+        np.arange(FIELDS["MonthlyIncome"].min, 20_001, 1000),
+        np.geomspace(20_000, FIELDS["MonthlyIncome"].max, 11).round(-3)
+    ])),
+    "TotalWorkingYears": np.arange(FIELDS["TotalWorkingYears"].min, FIELDS["TotalWorkingYears"].max + 1, 2),
+    "YearsAtCompany": np.arange(FIELDS["YearsAtCompany"].min, FIELDS["YearsAtCompany"].max + 1, 2),
+    "JobSatisfaction": np.arange(FIELDS["JobSatisfaction"].min, FIELDS["JobSatisfaction"].max + 1),
+    "WorkLifeBalance": np.arange(FIELDS["WorkLifeBalance"].min, FIELDS["WorkLifeBalance"].max + 1),
+    "EnvironmentSatisfaction": np.arange(
+        FIELDS["EnvironmentSatisfaction"].min, FIELDS["EnvironmentSatisfaction"].max + 1
+    ),
+    "OverTime": np.array([0, 1])
+}
+
+# Employees per predict_proba call; each brings one row per sweep point
+SWEEP_CHUNK_ROWS = 10_000
+
+# Departments larger than this are swept on a fixed random sample
+SWEEP_MAX_EMPLOYEES = 50_000
+
+
+def _grid(current=None):
+    # Feature index and value of every sweep point; ``current``'s own values
+    # are added so the sweep always contains the unchanged employee
+    sweeps = [SWEEPS[f] if current is None else np.union1d(SWEEPS[f], current[i])
+              for i, f in enumerate(FEATURES)]
+    features = np.concatenate([np.full(len(values), i) for i, values in enumerate(sweeps)])
+    return features, np.concatenate(sweeps).astype(np.float64)
+
+
+def sweep(pipeline, features, max_employees=SWEEP_MAX_EMPLOYEES, seed=0):
+    """Mean attrition probability with each feature set to each sweep value.
+
+    ``features`` is a prepared feature matrix (see
+    ``ScoringPipeline.prepare``) of one or more employees. Returns one row
+    per feature and value with the mean probability, its change from the
+    employees' own mean probability, and the share of employees the value
+    would change for. A single employee's own values are always among the
+    swept values.
+    """
+    features = np.asarray(features, dtype=np.float64)
+    if len(features) > max_employees:
+        rng = np.random.default_rng(seed)
+        features = features[np.sort(rng.choice(len(features), max_employees, replace=False))]
+
+    grid_features, grid_values = _grid(features[0] if len(features) == 1 else None)
+    points = len(grid_values)
+    totals = np.zeros(points)
+    changed = np.zeros(points)
+    baseline = 0.0
+    with span("what_if.sweep"):
+        for start in range(0, len(features), SWEEP_CHUNK_ROWS):
+            chunk = features[start:start + SWEEP_CHUNK_ROWS]
+            # A copy of each row per sweep point with one feature replaced,
+            # plus the unchanged row last for the baseline
+            grid = np.repeat(chunk[:, None, :], points + 1, axis=1)
+            grid[:, np.arange(points), grid_features] = grid_values
+            probability = pipeline.predict_proba(grid.reshape(-1, len(FEATURES))).reshape(len(chunk), -1)
+            totals += probability[:, :points].sum(axis=0)
+            baseline += probability[:, points].sum()
+            changed += (chunk[:, grid_features] != grid_values).sum(axis=0)
+
+    employees = max(len(features), 1)
+    probability = totals / employees
+    return pd.DataFrame({
+        "Feature": np.asarray(FEATURES)[grid_features],
+        "Value": grid_values,
+        "Probability": probability,
+        "Change": probability - baseline / employees,
+        "Affected": changed / employees
+    })
+
+
+def sensitivity(table):
+    """Per feature, the spread of mean probability across its sweep, largest first."""
+    spread = table.groupby("Feature", sort=False)["Probability"].agg(lambda p: p.max() - p.min())
+    return spread.sort_values(ascending=False)